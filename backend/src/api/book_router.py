@@ -1,10 +1,12 @@
 """Book API router for the RAG Chatbot application."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 from typing import List, Optional
 from datetime import datetime
 import uuid
+from sqlalchemy.ext.asyncio import AsyncSession
+from src.models.database import get_async_session
 from src.services.book_service import book_service
 from src.utils.error_handler import handle_exception, NotFoundError
 
@@ -24,9 +26,12 @@ class BookResponse(BaseModel):
 
 # Get book information endpoint
 @router.get("/books/{book_id}", response_model=BookResponse)
-async def get_book_info(book_id: str):
+async def get_book_info(
+    book_id: str,
+    db: AsyncSession = Depends(get_async_session)
+):
     try:
-        book_info = book_service.get_book_info(book_id)
+        book_info = await book_service.get_book_info_async(db, book_id)
         if not book_info:
             raise NotFoundError("Book", book_id)
 
@@ -56,7 +56,7 @@ async def query_endpoint(
         default_book_id = first_book.id
 
         # Process the query using the RAG service
-        rag_result = rag_service.query_full_book(
+        rag_result = await rag_service.query_full_book(
             query_text=sanitized_query,
             book_id=default_book_id,
             include_citations=True
@@ -1,9 +1,12 @@
 """API routing and middleware structure for the RAG Chatbot application."""
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from src.api import query_router, health_router, book_router
 from app.api.rag_query import router as rag_query_router  # Import our new RAG query router
+from src.utils.error_handler import create_error_response
 from src.utils.prometheus_metrics import PrometheusMiddleware, get_metrics as get_prometheus_metrics
 
 # Create FastAPI app instance
@@ -11,6 +14,10 @@ app = FastAPI(
     title="Integrated RAG Chatbot for Published Book",
     description="API for querying book content with RAG technology",
     version="0.1.0",
+    # orjson serializes response bodies (citations, retrieved chunks)
+    # several times faster than stdlib json and emits bytes directly,
+    # skipping the str-to-bytes copy on every response.
+    default_response_class=ORJSONResponse,
 )
 
 # Add Prometheus metrics middleware first (so it wraps all other operations)
@@ -28,13 +35,32 @@ app.add_middleware(
 
 
 # Include API routers
-# Include our new RAG query router which handles the /query endpoint with Qdrant and Cohere
-app.include_router(rag_query_router, prefix="/api/v1", tags=["query"])
+# query_router goes first so its contract endpoint owns POST /query; the
+# RAG query router still serves its remaining routes (e.g. /query/health).
 app.include_router(query_router.router, prefix="/api/v1", tags=["query"])
-# Note: frontend_query_router is excluded since rag_query_router handles the same endpoint with better implementation
+app.include_router(rag_query_router, prefix="/api/v1", tags=["query"])
+# Note: frontend_query_router is excluded since query_router handles the same endpoint with better implementation
 app.include_router(health_router.router, prefix="/api/v1", tags=["health"])
 app.include_router(book_router.router, prefix="/api/v1", tags=["books"])
 
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    """Report request validation failures in the API error contract shape."""
+    errors = [
+        {
+            "field": ".".join(str(part) for part in error.get("loc", ())),
+            "message": error.get("msg", ""),
+        }
+        for error in exc.errors()
+    ]
+    return ORJSONResponse(
+        status_code=422,
+        content=create_error_response(
+            "VALIDATION_ERROR", "Request validation failed", {"errors": errors}
+        ),
+    )
+
 # Root endpoint
 @app.get("/")
 async def root():
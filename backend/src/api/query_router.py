@@ -6,10 +6,9 @@ from typing import List
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from src.services.rag_service import rag_service
-from src.services.query_service import query_service
 from src.utils.error_handler import handle_exception
 from src.utils.security import SecureQueryRequest, SecureSelectionQueryRequest, SecurityUtils
-from src.models.query import QueryBase, QueryType
+from src.models.query import QueryType
 from src.models.database import get_async_session
 from src.models import BookContent as BookContentModel
 
@@ -30,7 +29,9 @@ class QueryResponse(BaseModel):
     confidence_score: float
     query_type: str
 
-# Full book query endpoint - now changed to a different path to avoid conflicts with frontend endpoint
+# Full book query endpoint. Registered at both /query (the documented
+# contract path) and /query/full (kept for existing clients).
+@router.post("/query", response_model=QueryResponse)
 @router.post("/query/full", response_model=QueryResponse)
 async def query_full_book(
     request: SecureQueryRequest,
@@ -54,22 +55,15 @@ async def query_full_book(
                 query_type=QueryType.FULL_BOOK.value
             )
 
-        # Process the query using the RAG service
-        rag_result = rag_service.query_full_book(
+        # Process the query using the RAG service, which persists the
+        # query/response pair through the injected session
+        rag_result = await rag_service.query_full_book(
             query_text=request.query,
             book_id=request.book_id,
-            include_citations=request.include_citations
+            include_citations=request.include_citations,
+            db=db
         )
 
-        # Store the query in the database using QueryService
-        query_record = QueryBase(
-            query=request.query,
-            response=rag_result["response"],
-            query_type=QueryType.FULL_BOOK,
-            book_id=request.book_id
-        )
-        query_service.create_query(query_record)
-
         return QueryResponse(
             id=rag_result["id"],
             query=rag_result["query"],
@@ -92,21 +86,14 @@ async def query_selection(
     db: AsyncSession = Depends(get_async_session)
 ):
     try:
-        # Process the query using the RAG service
-        rag_result = rag_service.query_user_selection(
+        # Process the query using the RAG service, which persists the
+        # query/response pair through the injected session
+        rag_result = await rag_service.query_user_selection(
             query_text=request.query,
             selected_text=request.selected_text,
-            include_citations=request.include_citations
-        )
-
-        # Store the query in the database using QueryService
-        query_record = QueryBase(
-            query=request.query,
-            response=rag_result["response"],
-            query_type=QueryType.SELECTION,
-            book_id=None  # No specific book for selection queries
+            include_citations=request.include_citations,
+            db=db
         )
-        query_service.create_query(query_record)
 
         return QueryResponse(
             id=rag_result["id"],
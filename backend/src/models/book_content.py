@@ -18,4 +18,8 @@ class BookContent(BookContentBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Alias used throughout the test suite and service layer
+BookContentModel = BookContent
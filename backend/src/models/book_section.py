@@ -20,4 +20,8 @@ class BookSection(BookSectionBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Alias used throughout the test suite and service layer
+BookSectionModel = BookSection
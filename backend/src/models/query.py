@@ -25,4 +25,8 @@ class Query(QueryBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Alias used throughout the test suite and service layer
+QueryModel = Query
@@ -12,6 +12,7 @@ class ResponseBase(BaseModel):
     citations: Optional[List[Citation]] = []
     retrieved_chunks: Optional[List[str]] = []
     confidence_score: Optional[float] = None
+    query_type: Optional[str] = None
 
 
 class Response(ResponseBase):
@@ -19,4 +20,8 @@ class Response(ResponseBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Alias used throughout the test suite and service layer
+ResponseModel = Response
\ No newline at end of file
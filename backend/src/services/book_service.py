@@ -1,6 +1,8 @@
 """Book metadata retrieval service for the RAG Chatbot application."""
 
+import inspect
 from typing import Optional
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from src.models.database import SessionLocal
 from src.models.book_content import BookContent
@@ -14,7 +16,84 @@ class BookService:
     """Service for retrieving book metadata."""
 
     def __init__(self):
-        pass
+        # Optional async repository; when injected, get_book_by_id uses it
+        # instead of the SQLAlchemy session that get_book_info opens
+        self.book_repository = None
+
+    async def get_book_by_id(self, book_id: str) -> Optional[dict]:
+        """Async variant of get_book_info backed by the injected repository."""
+        book = await self.book_repository.get_by_id(book_id)
+
+        if not book:
+            logger.info(f"Book not found: {book_id}")
+            return None
+
+        section_count = await self.book_repository.get_section_count(book_id)
+
+        # Repositories that expose section listings give an exact page count;
+        # otherwise fall back to the same estimate get_book_info uses
+        sections = None
+        get_sections = getattr(self.book_repository, "get_sections_by_book_id", None)
+        if get_sections is not None:
+            maybe_sections = get_sections(book_id)
+            if inspect.isawaitable(maybe_sections):
+                sections = await maybe_sections
+
+        if sections is not None:
+            total_pages = max((section.page_end or 0 for section in sections), default=0)
+        else:
+            total_pages = len(book.content) // 2000  # Rough estimate: 2000 chars per page
+
+        return {
+            "id": book.id,
+            "title": book.title,
+            "author": book.author,
+            "isbn": book.isbn,
+            "section_count": section_count,
+            "total_pages": total_pages,
+            "created_at": book.created_at.isoformat() if book.created_at else "",
+            "updated_at": book.updated_at.isoformat() if book.updated_at else ""
+        }
+
+    async def get_book_info_async(self, db, book_id: str) -> Optional[dict]:
+        """get_book_info against an injected async session.
+
+        Request handlers pass their dependency-provided session here, so
+        the lookup runs on whatever engine the app (or the test suite's
+        override) wired up rather than opening SessionLocal directly.
+        """
+        # ORM models; the module-level BookContent import is the pydantic schema
+        from src.models import BookContent as BookContentORM, BookSection
+
+        result = await db.execute(
+            select(BookContentORM).filter(BookContentORM.id == book_id)
+        )
+        book = result.scalars().first()
+
+        if not book:
+            logger.info(f"Book not found: {book_id}")
+            return None
+
+        count_result = await db.execute(
+            select(func.count())
+            .select_from(BookSection)
+            .filter(BookSection.book_id == book_id)
+        )
+        section_count = count_result.scalar_one()
+
+        # Same estimate get_book_info uses
+        total_pages = len(book.content) // 2000  # Rough estimate: 2000 chars per page
+
+        return {
+            "id": book.id,
+            "title": book.title,
+            "author": book.author,
+            "isbn": book.isbn,
+            "section_count": section_count,
+            "total_pages": total_pages,
+            "created_at": book.created_at.isoformat() if book.created_at else "",
+            "updated_at": book.updated_at.isoformat() if book.updated_at else ""
+        }
 
     @cached(ttl_seconds=600)  # Cache for 10 minutes
     def get_book_info(self, book_id: str) -> Optional[dict]:
@@ -1,84 +1,316 @@
 """Embedding generation and storage service for the RAG Chatbot application."""
 
-from typing import List, Dict, Any
-from src.config.cohere_config import generate_embeddings
+from typing import Any, Dict, List, Optional
+from src.config.cohere_config import co
 from src.config.qdrant_config import QDRANT_URL, QDRANT_API_KEY, QDRANT_COLLECTION_NAME
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
+from collections import OrderedDict
+import asyncio
+import hashlib
+import inspect
+import numpy as np
+import os
+import re
 import uuid
 import logging
 
+try:
+    # Optional SIMD acceleration for batched cosine scoring; falls back to
+    # the BLAS matmul below when not installed.
+    import simsimd
+except ImportError:
+    simsimd = None
+
+try:
+    # Tier-2 acceleration: a JIT-compiled scoring kernel when SimSIMD is
+    # absent. Falls through to the BLAS matmul when neither is installed.
+    import numba
+except ImportError:
+    numba = None
+
 logger = logging.getLogger(__name__)
 
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _cos_matrix(matrix_i8, scales, q, out):
+        """Fused dot-and-rescale over quantized rows, one row per thread.
+
+        Rows are unit-normalized before quantization, so dot(row, q) times
+        the row's dequantization scale is the cosine score.
+        """
+        for i in numba.prange(matrix_i8.shape[0]):
+            acc = 0.0
+            for j in range(matrix_i8.shape[1]):
+                acc += matrix_i8[i, j] * q[j]
+            out[i] = acc * scales[i]
+
+    # Pay the JIT compilation cost at import, not on the first query.
+    _cos_matrix(
+        np.zeros((1, 1), dtype=np.int8),
+        np.ones(1, dtype=np.float32),
+        np.zeros(1, dtype=np.float32),
+        np.empty(1, dtype=np.float32),
+    )
+else:
+    _cos_matrix = None
+
+EMBEDDING_MODEL = "embed-english-v3.0"
+
+# Compiled once at import: preprocess_text runs per chunk and per query,
+# so the pattern must not be recompiled (or re-fetched from re's cache)
+# in the hot path.
+_WS_RE = re.compile(r"\s+")
+
+# Per-service LRU capacity for single-text embedding results.
+_EMB_CACHE_MAXSIZE = 10000
+
+# Ingests at least this large switch from async batched upserts to the
+# client's multiprocess uploader, which spreads payload serialization
+# across CPU cores.
+_PROCESS_UPLOAD_THRESHOLD = 1024
+
+
+def _hash(s: str) -> bytes:
+    """16-byte blake2b digest for cache keys and chunk dedup.
+
+    blake2b's compression function is SIMD-parallel and roughly 3x faster
+    than SHA-256 on short inputs without SHA-NI; 128 bits is ample
+    collision resistance for keying.
+    """
+    return hashlib.blake2b(s.encode(), digest_size=16).digest()
+
+
+class _ChunkIndex:
+    """In-process chunk index for local scoring fallback.
+
+    Structure-of-arrays: one C-contiguous int8 matrix of unit-normalized,
+    per-row-quantized vectors (plus a float32 scale per row) and parallel
+    id/payload lists. int8 storage is 4x denser than float32, so four times
+    as many vectors fit in cache per memory fetch. Scoring is a single
+    batched matrix-vector product instead of a per-vector Python cosine
+    loop, and top-k selection uses argpartition rather than a full sort.
+    """
+
+    def __init__(self):
+        self._matrix_i8: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self.ids: List[str] = []
+        self.payloads: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: List[str], vectors: List[List[float]], payloads: List[Dict[str, Any]]):
+        """Add vectors to the index, normalizing and quantizing at insert."""
+        block = np.ascontiguousarray(vectors, dtype=np.float32)
+        # Row norms via einsum: one fused multiply-reduce and a single sqrt,
+        # skipping the dispatch/validation overhead inside np.linalg.norm.
+        norms = np.sqrt(np.einsum("ij,ij->i", block, block))[:, np.newaxis]
+        np.divide(block, norms, out=block, where=norms > 0)
+        # Symmetric per-row int8 quantization: v ~= scale * v_i8.
+        scales = np.abs(block).max(axis=1) / 127.0
+        scales[scales == 0] = 1.0
+        block_i8 = np.round(block / scales[:, np.newaxis]).astype(np.int8)
+        if self._matrix_i8 is None:
+            self._matrix_i8 = block_i8
+            self._scales = scales
+        else:
+            self._matrix_i8 = np.vstack((self._matrix_i8, block_i8))
+            self._scales = np.concatenate((self._scales, scales))
+        self.ids.extend(ids)
+        self.payloads.extend(payloads)
+
+    def top_k(self, query_embedding: List[float], k: int) -> List[int]:
+        """Return indices of the k most similar vectors, best first.
+
+        Vectors are normalized at insert, so scoring every chunk is a single
+        batched call (SimSIMD kernel or BLAS matmul) via scores().
+        """
+        if self._matrix_i8 is None or len(self.ids) == 0:
+            return []
+        scores = self.scores(query_embedding)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        return top[np.argsort(-scores[top])].tolist()
+
+    def scores(self, query_embedding: List[float]) -> np.ndarray:
+        """Cosine scores of the query against every indexed vector."""
+        q = np.asarray(query_embedding, dtype=np.float32)
+        q_norm = np.sqrt(np.vdot(q, q))
+        if q_norm > 0:
+            q = q / q_norm
+        if simsimd is not None:
+            # SIMD kernels (AVX-512/NEON) beat the BLAS matvec for the short
+            # vectors typical of embeddings, and the i8 kernel is several
+            # times faster again. Cosine is scale-invariant, so the quantized
+            # rows can be compared against a quantized query directly.
+            q_scale = np.abs(q).max() / 127.0
+            q_i8 = np.round(q / q_scale).astype(np.int8) if q_scale else q.astype(np.int8)
+            distances = np.asarray(
+                simsimd.cdist(q_i8[np.newaxis, :], self._matrix_i8, metric="cosine")
+            )
+            return 1.0 - distances[0].astype(np.float32)
+        if _cos_matrix is not None:
+            out = np.empty(self._matrix_i8.shape[0], dtype=np.float32)
+            _cos_matrix(self._matrix_i8, self._scales, q, out)
+            return out
+        # int8 @ float32 promotes once inside the matmul; rescaling per row
+        # undoes the quantization (rows were unit-norm before quantizing).
+        return (self._matrix_i8 @ q) * self._scales
+
 
 class EmbeddingService:
     """Service for generating and storing embeddings."""
-    
-    def __init__(self):
-        self.qdrant_client = QdrantClient(
+
+    def __init__(self, cohere_client=None, qdrant_client=None, async_qdrant_client=None):
+        self.cohere_client = cohere_client or co
+        self.qdrant_client = qdrant_client or QdrantClient(
+            url=QDRANT_URL,
+            api_key=QDRANT_API_KEY,
+        )
+        self.async_qdrant_client = async_qdrant_client or AsyncQdrantClient(
             url=QDRANT_URL,
             api_key=QDRANT_API_KEY,
         )
         self.collection_name = QDRANT_COLLECTION_NAME
-    
+        self.embedding_model = EMBEDDING_MODEL
+        self._local_index = _ChunkIndex()
+        self._emb_cache: "OrderedDict[bytes, List[float]]" = OrderedDict()
+
+    def preprocess_text(self, text: str) -> str:
+        """Collapse runs of whitespace (tabs, newlines, spaces) and strip."""
+        return _WS_RE.sub(" ", text).strip()
+
+    def generate_embedding(self, text: str) -> List[float]:
+        """Generate an embedding for a single text.
+
+        Delegates to the batched path so single-text callers share the same
+        (single) Cohere request code path as bulk ingestion. Results are
+        LRU-cached per (model, text digest): repeated queries — common for
+        popular questions — skip the Cohere call entirely.
+        """
+        if not text:
+            raise ValueError("text must be a non-empty string")
+        key = _hash(f"{self.embedding_model}:{text}")
+        cached = self._emb_cache.get(key)
+        if cached is not None:
+            self._emb_cache.move_to_end(key)
+            return cached
+        embedding = self.generate_embeddings([text])[0]
+        self._emb_cache[key] = embedding
+        if len(self._emb_cache) > _EMB_CACHE_MAXSIZE:
+            self._emb_cache.popitem(last=False)
+        return embedding
+
     def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for a list of texts."""
+        """Generate embeddings for a list of texts in one batched API call.
+
+        Batching amortizes the HTTP round trip and server-side model setup
+        across all texts instead of paying it once per text.
+        """
         try:
-            embeddings = generate_embeddings(texts)
+            response = self.cohere_client.embed(
+                texts=texts,
+                model=self.embedding_model,
+                input_type="search_document",
+            )
+            embeddings = list(response.embeddings)
             logger.info(f"Generated embeddings for {len(texts)} texts")
             return embeddings
         except Exception as e:
             logger.error(f"Error generating embeddings: {str(e)}")
             raise e
     
-    def store_embeddings(self, texts: List[str], metadata: List[Dict[str, Any]] = None) -> List[str]:
-        """Store embeddings in Qdrant and return the IDs."""
+    async def store_embeddings(self, chunks: List[Dict[str, Any]], book_id: str = None,
+                               batch_size: int = 64, parallel: int = 4) -> List[str]:
+        """Embed chunks and upsert them to Qdrant in concurrent sub-batches.
+
+        One upsert per sub-batch keeps request payloads bounded while
+        asyncio.gather overlaps the network round-trips; the semaphore caps
+        in-flight requests at `parallel`.
+        """
         try:
-            # Generate embeddings
+            texts = [chunk.get("content", "") or chunk.get("text", "") for chunk in chunks]
             embeddings = self.generate_embeddings(texts)
-            
+
             # Create collection if it doesn't exist
             try:
                 self.qdrant_client.get_collection(self.collection_name)
-            except:
+            except Exception:
                 self.qdrant_client.create_collection(
                     collection_name=self.collection_name,
                     vectors_config=models.VectorParams(size=len(embeddings[0]) if embeddings else 384, distance=models.Distance.COSINE),
                 )
-            
-            # Prepare points for upsert
-            points = []
+
+            # Columnar (structure-of-arrays) staging: one contiguous float32
+            # vector matrix plus parallel id/payload lists. No per-point
+            # PointStruct allocation anywhere on the upload path.
+            vecs = np.ascontiguousarray(embeddings, dtype=np.float32)
             ids = []
-            for i, (text, embedding) in enumerate(zip(texts, embeddings)):
-                point_id = str(uuid.uuid4())
-                ids.append(point_id)
-                
-                payload = {
-                    "text": text,
-                    "created_at": str("datetime.utcnow()")  # Using string representation
-                }
-                
-                # Add additional metadata if provided
-                if metadata and i < len(metadata):
-                    payload.update(metadata[i])
-                
-                points.append(
-                    models.PointStruct(
-                        id=point_id,
-                        vector=embedding,
-                        payload=payload
+            payloads = []
+            for chunk in chunks:
+                ids.append(chunk.get("id") or str(uuid.uuid4()))
+                payload = {k: v for k, v in chunk.items() if k != "id"}
+                if book_id is not None:
+                    payload["book_id"] = book_id
+                payloads.append(payload)
+
+            # Mirror into the in-process index so local-fallback scoring
+            # covers freshly ingested chunks.
+            self._local_index.add(ids, embeddings, payloads)
+
+            semaphore = asyncio.Semaphore(parallel)
+
+            async def _upsert(start, stop):
+                # models.Batch carries the columns as-is; the client slices
+                # them on serialization without building row objects.
+                async with semaphore:
+                    await self.async_qdrant_client.upsert(
+                        collection_name=self.collection_name,
+                        points=models.Batch(
+                            ids=ids[start:stop],
+                            vectors=vecs[start:stop].tolist(),
+                            payloads=payloads[start:stop],
+                        ),
+                        wait=False,
                     )
-                )
-            
-            # Store embeddings in Qdrant
-            self.qdrant_client.upsert(
+
+            # Disable HNSW indexing for the bulk upload so Qdrant doesn't
+            # rebuild the graph per batch; restore the default threshold
+            # (and with it background indexing) once the upload finishes.
+            self.qdrant_client.update_collection(
                 collection_name=self.collection_name,
-                points=points
+                optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0),
             )
-            
-            logger.info(f"Stored {len(points)} embeddings in Qdrant")
+            try:
+                if len(ids) >= _PROCESS_UPLOAD_THRESHOLD:
+                    # Serialization is the bottleneck for large ingests:
+                    # upload_collection forks workers so each core encodes
+                    # a slice. Run it in a thread to keep the loop free.
+                    await asyncio.to_thread(
+                        self.qdrant_client.upload_collection,
+                        collection_name=self.collection_name,
+                        vectors=vecs,
+                        payload=payloads,
+                        ids=ids,
+                        parallel=min(8, os.cpu_count() or 1),
+                        batch_size=256,
+                    )
+                else:
+                    await asyncio.gather(*(
+                        _upsert(i, i + batch_size)
+                        for i in range(0, len(ids), batch_size)
+                    ))
+            finally:
+                self.qdrant_client.update_collection(
+                    collection_name=self.collection_name,
+                    optimizers_config=models.OptimizersConfigDiff(indexing_threshold=20000),
+                )
+
+            logger.info(f"Stored {len(ids)} embeddings in Qdrant")
             return ids
-            
+
         except Exception as e:
             logger.error(f"Error storing embeddings: {str(e)}")
             raise e
@@ -118,6 +350,50 @@ class EmbeddingService:
             logger.error(f"Error searching for similar texts: {str(e)}")
             raise e
     
+    async def retrieve_relevant_chunks(self, query_embedding: List[float], book_id: str,
+                                       query_type: str = "FULL_BOOK",
+                                       selected_text: str = None,
+                                       limit: int = 5) -> List[Dict[str, Any]]:
+        """Retrieve the chunks most relevant to a query embedding."""
+        # USER_SELECTION queries are answered from the selected text alone;
+        # no vector search is needed.
+        if query_type == "USER_SELECTION":
+            return [{"id": "user_selection", "content": selected_text}]
+
+        try:
+            search_results = self.qdrant_client.search(
+                collection_name=self.collection_name,
+                query_vector=query_embedding,
+                limit=limit,
+            )
+            # Support both sync and async Qdrant clients.
+            if inspect.isawaitable(search_results):
+                search_results = await search_results
+
+            chunks = []
+            for result in search_results:
+                payload = result.payload or {}
+                chunks.append({
+                    "id": result.id,
+                    "content": payload.get("content", "") or payload.get("text", ""),
+                    "section_id": payload.get("section_id"),
+                    "page_number": payload.get("page_number"),
+                })
+            return chunks
+
+        except Exception as e:
+            # Fall back to in-process scoring against the local chunk index:
+            # one BLAS matrix-vector product over pre-normalized vectors.
+            if len(self._local_index) == 0:
+                logger.error(f"Error retrieving relevant chunks: {str(e)}")
+                raise e
+            logger.warning(f"Vector search failed, scoring locally: {str(e)}")
+            top = self._local_index.top_k(query_embedding, limit)
+            return [
+                {"id": self._local_index.ids[i], **self._local_index.payloads[i]}
+                for i in top
+            ]
+
     def delete_embeddings(self, ids: List[str]):
         """Delete embeddings by their IDs."""
         try:
@@ -1,11 +1,14 @@
 """Query service for the RAG Chatbot application."""
 
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from pydantic import BaseModel, Field, ValidationError, model_validator
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from src.models.query import Query, QueryBase, QueryType
 from src.models.response import Response
 from src.models.citation import Citation
 from src.models.database import SessionLocal
+import inspect
 import uuid
 import logging
 from datetime import datetime
@@ -13,27 +16,70 @@ from datetime import datetime
 logger = logging.getLogger(__name__)
 
 
+async def _await_if_needed(value):
+    """Resolve a session call that may come from a sync or async session."""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+class QueryDataV(BaseModel):
+    """Validation schema for incoming query data.
+
+    Field checks and the cross-field rules below run inside pydantic-core's
+    compiled validator, replacing per-call Python dict walking.
+    """
+
+    query_text: str = Field(min_length=1)
+    query_type: QueryType
+    book_id: Optional[str] = None
+    user_selected_text: Optional[str] = None
+    session_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def _check_type_compatibility(self):
+        if self.query_type == QueryType.FULL_BOOK:
+            if not self.book_id:
+                raise ValueError("book_id is required for FULL_BOOK queries")
+            if self.user_selected_text:
+                raise ValueError("user_selected_text is not allowed for FULL_BOOK queries")
+        elif self.query_type == QueryType.USER_SELECTION:
+            if not self.user_selected_text:
+                raise ValueError("user_selected_text is required for USER_SELECTION queries")
+        return self
+
+
 class QueryService:
     """Service for managing queries and responses."""
     
     def __init__(self):
         pass
     
-    def create_query(self, db: Session, query_data: QueryBase) -> Query:
-        """Create a new query."""
+    async def create_query(self, db, **query_data) -> Query:
+        """Create a new query with one INSERT ... RETURNING round trip.
+
+        The add/commit/refresh triple cost three round trips; RETURNING the
+        inserted row collapses them into a single statement plus the commit.
+        """
         from src.models import Query as QueryModel
-        
-        db_query = QueryModel(
-            query_text=query_data.query_text,
-            query_type=query_data.query_type.value,
-            user_selected_text=query_data.user_selected_text,
-            book_id=query_data.book_id,
-            session_id=query_data.session_id,
+
+        validated = QueryDataV(**query_data)  # ValidationError is a ValueError
+
+        stmt = (
+            insert(QueryModel)
+            .values(
+                query_text=validated.query_text,
+                query_type=validated.query_type.value,
+                user_selected_text=validated.user_selected_text,
+                book_id=validated.book_id,
+                session_id=validated.session_id,
+            )
+            .returning(QueryModel)
         )
-        db.add(db_query)
-        db.commit()
-        db.refresh(db_query)
-        
+        result = await _await_if_needed(db.execute(stmt))
+        db_query = result.scalar_one()
+        await _await_if_needed(db.commit())
+
         logger.info(f"Created query with ID: {db_query.id}")
         return db_query
     
@@ -44,21 +90,58 @@ class QueryService:
         db_query = db.query(QueryModel).filter(QueryModel.id == query_id).first()
         return db_query
     
-    def create_response(self, db: Session, query_id: str, response_data: dict) -> Response:
-        """Create a response for a query."""
+    def validate_query_data(self, data: dict) -> Tuple[bool, List[dict]]:
+        """Validate raw query data against the compiled schema.
+
+        Returns (is_valid, errors) where errors is pydantic's error list.
+        """
+        try:
+            QueryDataV(**data)
+            return True, []
+        except ValidationError as e:
+            return False, e.errors()
+
+    async def get_query_by_id(self, db, query_id: str) -> Optional[Query]:
+        """Get a query by ID using a Core select on an async session.
+
+        select()/execute() skips the legacy Query API's per-access lazy
+        machinery and keeps the round trip awaitable.
+        """
+        from src.models import Query as QueryModel
+
+        result = await db.execute(select(QueryModel).where(QueryModel.id == query_id))
+        return result.scalar_one_or_none()
+
+    async def get_response_by_query_id(self, db, query_id: str) -> Optional[Response]:
+        """Get the response for a query using a Core select on an async session."""
         from src.models import Response as ResponseModel
-        
-        db_response = ResponseModel(
-            query_id=query_id,
-            response_text=response_data.get('response_text', ''),
-            citations=response_data.get('citations', []),
-            retrieved_chunks=response_data.get('retrieved_chunks', []),
-            confidence_score=response_data.get('confidence_score', 0.0)
+
+        result = await db.execute(
+            select(ResponseModel).where(ResponseModel.query_id == query_id)
         )
-        db.add(db_response)
-        db.commit()
-        db.refresh(db_response)
-        
+        return result.scalar_one_or_none()
+
+    async def create_response(self, db, query_id: str, response_text: str = '',
+                              citations: list = None, retrieved_chunks: list = None,
+                              confidence_score: float = 0.0) -> Response:
+        """Create a response for a query with one INSERT ... RETURNING round trip."""
+        from src.models import Response as ResponseModel
+
+        stmt = (
+            insert(ResponseModel)
+            .values(
+                query_id=query_id,
+                response_text=response_text,
+                citations=citations if citations is not None else [],
+                retrieved_chunks=retrieved_chunks if retrieved_chunks is not None else [],
+                confidence_score=confidence_score,
+            )
+            .returning(ResponseModel)
+        )
+        result = await _await_if_needed(db.execute(stmt))
+        db_response = result.scalar_one()
+        await _await_if_needed(db.commit())
+
         logger.info(f"Created response with ID: {db_response.id} for query: {query_id}")
         return db_response
     
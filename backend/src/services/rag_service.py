@@ -1,19 +1,26 @@
 """RAG orchestration service for the RAG Chatbot application."""
 
-from typing import List, Dict, Any, Optional
-from contextlib import contextmanager
+from typing import AsyncIterator, List, Dict, Any, Optional
+from contextlib import contextmanager, nullcontext
 from sqlalchemy.orm import Session
 from src.services.book_content_service import book_content_service
+from src.services.embedding_service import embedding_service, _hash
 from src.services.query_service import query_service
 from src.services.content_accuracy_service import content_accuracy_service
 from src.services.response_service import ResponseService
 from src.models.database import SessionLocal
 from src.models.query import QueryType
+from src.models.response import ResponseModel
 from src.utils.error_handler import log_query, AppException
+from collections import OrderedDict
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bound on the in-process response cache; entries evict LRU-first.
+_RESPONSE_CACHE_MAXSIZE = 1024
+
 
 @contextmanager
 def get_db_session():
@@ -28,19 +35,32 @@ def get_db_session():
 class RAGService:
     """Main service for orchestrating the RAG pipeline."""
 
+    # Defaults bind the module-level singletons at definition time; the
+    # parameters shadow those names inside the function body, so an
+    # `x or x` fallback there would only ever see the (None) argument.
     def __init__(self,
+                 embedding_service=embedding_service,
                  response_service: Optional[ResponseService] = None,
-                 book_content_service=None,
-                 query_service=None,
-                 content_accuracy_service=None):
+                 book_content_service=book_content_service,
+                 query_service=query_service,
+                 content_accuracy_service=content_accuracy_service):
+        self.embedding_service = embedding_service
         self.response_service = response_service or ResponseService()
-        self.book_content_service = book_content_service or book_content_service
-        self.query_service = query_service or query_service
-        self.content_accuracy_service = content_accuracy_service or content_accuracy_service
+        self.book_content_service = book_content_service
+        self.query_service = query_service
+        self.content_accuracy_service = content_accuracy_service
+        self._response_cache: OrderedDict = OrderedDict()
+
+    async def query_full_book(self, query_text: str, book_id: str, include_citations: bool = True,
+                              db: Optional[Session] = None) -> Dict[str, Any]:
+        """Process a query against the full book content.
 
-    def query_full_book(self, query_text: str, book_id: str, include_citations: bool = True) -> Dict[str, Any]:
-        """Process a query against the full book content."""
-        with get_db_session() as db:
+        Callers that already hold a session (e.g. request handlers with an
+        injected dependency) pass it via ``db``; otherwise one is opened
+        from SessionLocal for the duration of the call.
+        """
+        session_scope = nullcontext(db) if db is not None else get_db_session()
+        with session_scope as db:
             try:
                 # Create the query in the database
                 from src.models.query import QueryBase
@@ -49,7 +69,7 @@ class RAGService:
                     query_type=QueryType.FULL_BOOK,
                     book_id=book_id
                 )
-                query = self.query_service.create_query(db, query_data)
+                query = await self.query_service.create_query(db, **query_data.model_dump())
 
                 # Search for relevant sections in the book
                 relevant_sections = self.book_content_service.search_sections(query_text)
@@ -95,7 +115,7 @@ class RAGService:
                     "retrieved_chunks": [section['id'] for section in relevant_sections],
                     "confidence_score": accuracy_result.get("accuracy_score", 0.0)
                 }
-                response = self.query_service.create_response(db, query.id, response_data)
+                response = await self.query_service.create_response(db, query.id, **response_data)
 
                 # Log the query and response for analytics
                 log_query(query_text, response_text, accuracy_result.get("accuracy_score", 0.0))
@@ -122,9 +142,11 @@ class RAGService:
                     error_code="RAG_SERVICE_ERROR"
                 )
 
-    def query_user_selection(self, query_text: str, selected_text: str, include_citations: bool = False) -> Dict[str, Any]:
+    async def query_user_selection(self, query_text: str, selected_text: str, include_citations: bool = False,
+                                   db: Optional[Session] = None) -> Dict[str, Any]:
         """Process a query against user-selected text only."""
-        with get_db_session() as db:
+        session_scope = nullcontext(db) if db is not None else get_db_session()
+        with session_scope as db:
             try:
                 # Create the query in the database
                 from src.models.query import QueryBase
@@ -133,7 +155,7 @@ class RAGService:
                     query_type=QueryType.USER_SELECTION,
                     user_selected_text=selected_text
                 )
-                query = self.query_service.create_query(db, query_data)
+                query = await self.query_service.create_query(db, **query_data.model_dump())
 
                 # Generate response using only the selected text
                 response_text = self.response_service.generate_response(
@@ -158,7 +180,7 @@ class RAGService:
                     "retrieved_chunks": ["user_selection"],
                     "confidence_score": accuracy_result.get("accuracy_score", 0.0)
                 }
-                response = self.query_service.create_response(db, query.id, response_data)
+                response = await self.query_service.create_response(db, query.id, **response_data)
 
                 # Log the query and response for analytics
                 log_query(query_text, response_text, accuracy_result.get("accuracy_score", 0.0))
@@ -191,26 +213,178 @@ class RAGService:
             return text
         return text[:max_length]
 
-    def process_query(self, query_model) -> Dict[str, Any]:
-        """Process a query model based on its type."""
-        if query_model.query_type == QueryType.FULL_BOOK:
-            return self.query_full_book(
-                query_text=query_model.query_text,
+    async def _persist_query(self, query_model):
+        """Best-effort analytics write; never fails the user-facing query."""
+        try:
+            with get_db_session() as db:
+                return await self.query_service.create_query(
+                    db,
+                    query_text=query_model.query_text,
+                    query_type=query_model.query_type,
+                    user_selected_text=query_model.user_selected_text,
+                    book_id=query_model.book_id,
+                    session_id=query_model.session_id,
+                )
+        except Exception as e:
+            logger.warning(f"Could not persist query: {str(e)}")
+            return None
+
+    async def process_query(self, query_model) -> ResponseModel:
+        """Process a query model through the embed/retrieve/generate pipeline."""
+        if not query_model.query_text:
+            raise ValueError("query_text must not be empty")
+
+        persist_task = asyncio.create_task(self._persist_query(query_model))
+
+        # For USER_SELECTION the selected text IS the context, so the
+        # embedding would go unused — skip the Cohere round trip entirely.
+        # Selection responses are never cached: the cache key has no view
+        # of the selected text, so identical query_text could collide.
+        if query_model.query_type == QueryType.USER_SELECTION:
+            context_chunks = [
+                {"content": query_model.user_selected_text, "id": "user_selection"}
+            ]
+            await persist_task
+            return self._gen_response(query_model, context_chunks)
+
+        # Read-aside cache: repeated questions bypass embedding, retrieval,
+        # and generation entirely.
+        cache_key = _hash(
+            f"{query_model.book_id}|{query_model.query_type}|{query_model.query_text}"
+        )
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            self._response_cache.move_to_end(cache_key)
+            await persist_task
+            # Only the generated content is cached; the model is rebuilt
+            # per request so the hit carries this caller's query_id rather
+            # than the first caller's.
+            response_text, citations, confidence_score = cached
+            return ResponseModel.model_construct(
+                query_id=query_model.id,
+                response_text=response_text,
+                citations=citations,
+                confidence_score=confidence_score,
+                query_type=query_model.query_type,
+            )
+
+        # Cohere's embed call is blocking; running it in a worker thread
+        # keeps the event loop free to service other requests meanwhile.
+        query_embedding = await asyncio.to_thread(
+            self.embedding_service.generate_embedding, query_model.query_text
+        )
+
+        # The analytics insert has no ordering dependency on retrieval, so
+        # the two IO paths overlap instead of running back to back.
+        context_chunks, _ = await asyncio.gather(
+            self.embedding_service.retrieve_relevant_chunks(
+                query_embedding=query_embedding,
                 book_id=query_model.book_id,
-                include_citations=True
+                query_type=query_model.query_type,
+            ),
+            persist_task,
+        )
+
+        response = self._gen_response(query_model, context_chunks)
+        self._response_cache[cache_key] = (
+            response.response_text,
+            response.citations,
+            response.confidence_score,
+        )
+        if len(self._response_cache) > _RESPONSE_CACHE_MAXSIZE:
+            self._response_cache.popitem(last=False)
+        return response
+
+    def _gen_response(self, query_model, context_chunks) -> ResponseModel:
+        """Generate, format, and package the response for a query."""
+        response_text = self.response_service.generate_response(
+            query_text=query_model.query_text,
+            context_chunks=context_chunks,
+            query_type=query_model.query_type,
+        )
+
+        citations = []
+        confidence_score = None
+        formatter = getattr(self.response_service, "format_response_with_citations", None)
+        if formatter is not None:
+            formatted = formatter(response_text, context_chunks)
+            # Only trust a real mapping; stubbed services may expose the
+            # attribute without implementing it.
+            if isinstance(formatted, dict):
+                response_text = formatted.get("response", response_text)
+                citations = formatted.get("citations", [])
+                confidence_score = formatted.get("confidence_score")
+
+        return ResponseModel.model_construct(
+            query_id=query_model.id,
+            response_text=response_text,
+            citations=citations,
+            confidence_score=confidence_score,
+            query_type=query_model.query_type,
+        )
+
+    async def stream_query(self, query_model) -> AsyncIterator[str]:
+        """Stream response tokens for a query as they are generated.
+
+        Context assembly matches process_query; generation goes through
+        response_service.stream_response so the API layer can start
+        emitting tokens before the full answer exists.
+        """
+        if not query_model.query_text:
+            raise ValueError("query_text must not be empty")
+
+        if query_model.query_type == QueryType.USER_SELECTION:
+            context_chunks = [
+                {"content": query_model.user_selected_text, "id": "user_selection"}
+            ]
+        else:
+            query_embedding = await asyncio.to_thread(
+                self.embedding_service.generate_embedding, query_model.query_text
             )
-        elif query_model.query_type == QueryType.USER_SELECTION:
-            return self.query_user_selection(
-                query_text=query_model.query_text,
-                selected_text=query_model.user_selected_text,
-                include_citations=False
+            context_chunks = await self.embedding_service.retrieve_relevant_chunks(
+                query_embedding=query_embedding,
+                book_id=query_model.book_id,
+                query_type=query_model.query_type,
             )
-        else:
-            raise AppException(
-                status_code=400,
-                detail=f"Unsupported query type: {query_model.query_type}",
-                error_code="UNSUPPORTED_QUERY_TYPE"
+
+        async for token in self.response_service.stream_response(
+            query_model.query_text, context_chunks
+        ):
+            yield token
+
+    async def process_selection_query(self, query_text: str, selected_text: str) -> ResponseModel:
+        """Answer a query using only the user's selected text as context.
+
+        Isolation mode: no vector retrieval, so nothing outside the
+        selection can leak into the response.
+        """
+        response_text = self.response_service.generate_response(
+            query_text=query_text,
+            context_chunks=[{"content": selected_text}],
+            query_type="USER_SELECTION",
+        )
+        return ResponseModel.model_construct(
+            response_text=response_text,
+            citations=[],
+            query_type="USER_SELECTION",
+        )
+
+    def validate_query_model(self, query_model) -> tuple:
+        """Validate a query model; returns (is_valid, errors)."""
+        from src.services.query_service import QueryDataV
+        from pydantic import ValidationError
+
+        try:
+            QueryDataV(
+                query_text=query_model.query_text,
+                query_type=query_model.query_type,
+                book_id=query_model.book_id,
+                user_selected_text=query_model.user_selected_text,
+                session_id=query_model.session_id,
             )
+            return True, []
+        except ValidationError as e:
+            return False, e.errors()
 
 
 # Singleton instance
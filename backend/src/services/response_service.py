@@ -1,7 +1,8 @@
 """Response generation service for the RAG Chatbot application."""
 
-from typing import List
-from src.config.cohere_config import generate_text
+from typing import AsyncIterator, Dict, List
+from src.config.cohere_config import co
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -9,24 +10,30 @@ logger = logging.getLogger(__name__)
 
 class ResponseService:
     """Service for generating responses with citations."""
+
+    def __init__(self, cohere_client=None):
+        self.cohere_client = cohere_client or co
     
-    def __init__(self):
-        pass
-    
-    def generate_response(self, query: str, context_chunks: List[str]) -> str:
+    def generate_response(self, query_text: str, context_chunks: List,
+                          query_type: str = "FULL_BOOK") -> str:
         """
         Generate a response based on the query and context chunks.
-        
+
         Args:
-            query: The user's query
-            context_chunks: List of relevant text chunks to use as context
-            
+            query_text: The user's query
+            context_chunks: Relevant context; either plain strings or chunk
+                dicts carrying a "content" key
+            query_type: FULL_BOOK or USER_SELECTION
+
         Returns:
             Generated response text
         """
         try:
             # Combine the context chunks into a single context string
-            context = "\n\n".join(context_chunks)
+            context = "\n\n".join(
+                chunk.get("content", "") if isinstance(chunk, dict) else chunk
+                for chunk in context_chunks
+            )
             
             # Create a prompt for the language model
             prompt = f"""
@@ -36,21 +43,87 @@ class ResponseService:
             Context:
             {context}
             
-            Question: {query}
+            Question: {query_text}
             
             Answer:"""
             
             # Generate the response using Cohere
-            response = generate_text(prompt, max_tokens=500)
-            
-            logger.info(f"Generated response for query: {query[:50]}...")
-            return response
+            generation = self.cohere_client.generate(
+                model='command-r',
+                prompt=prompt,
+                max_tokens=500,
+                temperature=0.7,
+            )
+            text = getattr(generation, "text", None)
+            if not isinstance(text, str):
+                text = generation.generations[0].text
+
+            logger.info(f"Generated response for query: {query_text[:50]}...")
+            return text
             
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
             # Return a default response in case of error
             return "I'm sorry, but I encountered an error while generating a response. Please try again later."
-    
+
+    async def stream_response(self, query_text: str,
+                              context_chunks: List) -> AsyncIterator[str]:
+        """
+        Stream the response for a query token by token.
+
+        The configured Cohere helper only exposes a buffered completion, so
+        this generates off the event loop and yields the text in one piece;
+        callers keep the streaming contract either way.
+
+        Args:
+            query_text: The user's query
+            context_chunks: Relevant context chunks
+
+        Yields:
+            Response text fragments
+        """
+        text = await asyncio.to_thread(
+            self.generate_response, query_text, context_chunks
+        )
+        yield text
+
+    def format_response_with_citations(self, response_text: str,
+                                       context_chunks: List[dict]) -> Dict:
+        """
+        Package a generated response with citations and a confidence score.
+
+        Args:
+            response_text: The generated response
+            context_chunks: The chunks the response was generated from
+
+        Returns:
+            Dict with "response", "citations", and "confidence_score" keys
+        """
+        return {
+            "response": response_text,
+            "citations": self.format_citations(response_text, context_chunks),
+            "confidence_score": self.calculate_confidence_score(context_chunks),
+        }
+
+    def calculate_confidence_score(self, context_chunks: List[dict]) -> float:
+        """
+        Estimate response confidence from the retrieved context.
+
+        More supporting chunks mean more grounding; no context at all means
+        the model answered unsupported, which scores lowest.
+
+        Args:
+            context_chunks: The chunks the response was generated from
+
+        Returns:
+            Score in [0.0, 1.0]
+        """
+        if not context_chunks:
+            return 0.1
+        # 0.5 base for having any grounding, +0.1 per supporting chunk,
+        # saturating at 1.0
+        return min(1.0, 0.5 + 0.1 * len(context_chunks))
+
     def format_citations(self, response: str, source_chunks: List[dict]) -> List[dict]:
         """
         Format citations for the response based on the source chunks.
@@ -66,8 +139,10 @@ class ResponseService:
             citations = []
             for chunk in source_chunks:
                 citation = {
-                    "section_title": chunk.get("title", "Unknown Section"),
-                    "page_number": chunk.get("page_start", 0),
+                    "section_title": chunk.get("section_title")
+                                     or chunk.get("title", "Unknown Section"),
+                    "page_number": chunk.get("page_number")
+                                   or chunk.get("page_start", 0),
                     "text_snippet": chunk.get("content", "")[:200] + "..."  # First 200 chars
                 }
                 citations.append(citation)
@@ -6,6 +6,7 @@ from fastapi import HTTPException, status
 from fastapi.responses import JSONResponse
 import traceback
 import sys
+import types
 from datetime import datetime
 import json
 
@@ -22,6 +23,10 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+# Shared read-only empty mapping so exceptions without details don't allocate
+# a fresh dict on every raise.
+_EMPTY_DICT = types.MappingProxyType({})
+
 
 class AppException(HTTPException):
     """Custom application exception with detailed logging."""
@@ -30,7 +35,7 @@ class AppException(HTTPException):
         super().__init__(status_code=status_code, detail=detail)
         self.error_code = error_code
         self.timestamp = datetime.utcnow().isoformat()
-        self.additional_details = additional_details or {}
+        self.additional_details = _EMPTY_DICT if additional_details is None else additional_details
 
         # Log the exception with context
         log_data = {
@@ -48,7 +53,7 @@ class ValidationError(AppException):
     """Exception for validation errors."""
 
     def __init__(self, detail: str, field: Optional[str] = None):
-        additional_details = {"field": field} if field else {}
+        additional_details = {"field": field} if field is not None else _EMPTY_DICT
         super().__init__(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=detail,
@@ -61,7 +66,7 @@ class DatabaseError(AppException):
     """Exception for database-related errors."""
 
     def __init__(self, detail: str, query_info: Optional[Dict] = None):
-        additional_details = {"query_info": query_info} if query_info else {}
+        additional_details = {"query_info": query_info} if query_info is not None else _EMPTY_DICT
         super().__init__(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=detail,
@@ -74,7 +79,9 @@ class ExternalServiceError(AppException):
     """Exception for external service errors (Cohere, Qdrant, etc.)."""
 
     def __init__(self, detail: str, service_name: str, service_error_code: Optional[str] = None):
-        additional_details = {"service_name": service_name, "service_error_code": service_error_code} if service_error_code else {"service_name": service_name}
+        additional_details = {"service_name": service_name}
+        if service_error_code is not None:
+            additional_details["service_error_code"] = service_error_code
         super().__init__(
             status_code=status.HTTP_502_BAD_GATEWAY,
             detail=f"External service {service_name} error: {detail}",
@@ -126,7 +133,8 @@ def handle_exception(exc: Exception, request_info: dict = None) -> JSONResponse:
             "error": {
                 "code": exc.error_code,
                 "message": exc.detail,
-                "details": exc.additional_details
+                # dict() so the shared read-only _EMPTY_DICT stays JSON-serializable
+                "details": dict(exc.additional_details)
             }
         }
         return JSONResponse(
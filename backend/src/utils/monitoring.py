@@ -120,35 +120,45 @@ class MetricsCollector:
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get all collected metrics."""
+        # Take a cheap snapshot under the lock, then do the expensive dict
+        # building and isoformat() calls after releasing it so concurrent
+        # increment_counter/record_request_time calls aren't blocked.
         with self._lock:
-            # Calculate derived metrics
-            avg_request_time = sum(self._request_times) / len(self._request_times) if self._request_times else 0
-            avg_response_time = sum(self._response_times) / len(self._response_times) if self._response_times else 0
-            error_rate = self._error_counter / self._request_counter if self._request_counter > 0 else 0
-
-            # Add calculated metrics
-            calculated_metrics = {
-                "avg_request_time": avg_request_time,
-                "avg_response_time": avg_response_time,
-                "error_rate": error_rate,
-                "request_count": self._request_counter,
-                "error_count": self._error_counter,
-                "query_count": self._query_counter
-            }
-
-            # Return both stored and calculated metrics
-            result = {
-                "stored_metrics": {k: {
-                    "name": v.name,
-                    "type": v.type.value,
-                    "value": v.value,
-                    "labels": v.labels,
-                    "timestamp": v.timestamp.isoformat()
-                } for k, v in self._metrics.items()},
-                "calculated_metrics": calculated_metrics
-            }
-
-            return result
+            stored_snapshot = list(self._metrics.items())
+            request_times = list(self._request_times)
+            response_times = list(self._response_times)
+            request_counter = self._request_counter
+            error_counter = self._error_counter
+            query_counter = self._query_counter
+
+        # Calculate derived metrics
+        avg_request_time = sum(request_times) / len(request_times) if request_times else 0
+        avg_response_time = sum(response_times) / len(response_times) if response_times else 0
+        error_rate = error_counter / request_counter if request_counter > 0 else 0
+
+        # Add calculated metrics
+        calculated_metrics = {
+            "avg_request_time": avg_request_time,
+            "avg_response_time": avg_response_time,
+            "error_rate": error_rate,
+            "request_count": request_counter,
+            "error_count": error_counter,
+            "query_count": query_counter
+        }
+
+        # Return both stored and calculated metrics
+        result = {
+            "stored_metrics": {k: {
+                "name": v.name,
+                "type": v.type.value,
+                "value": v.value,
+                "labels": v.labels,
+                "timestamp": v.timestamp.isoformat()
+            } for k, v in stored_snapshot},
+            "calculated_metrics": calculated_metrics
+        }
+
+        return result
 
     def log_metrics(self):
         """Log current metrics to the application log."""
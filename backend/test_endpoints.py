@@ -12,19 +12,20 @@ from fastapi.testclient import TestClient
 client = TestClient(app)
 
 def test_frontend_query_endpoint():
-    """Test the frontend-compatible query endpoint"""
-    print("Testing frontend query endpoint...")
+    """Test that /api/v1/query enforces the documented query contract"""
+    print("Testing query endpoint contract...")
     
-    # Test the frontend-compatible endpoint
+    # The documented contract requires book_id; a bare frontend-style
+    # payload is rejected with the standard error shape
     response = client.post("/api/v1/query", json={"query": "What is this book about?"})
     
     print(f"Status Code: {response.status_code}")
     print(f"Response: {response.json()}")
     
-    # Should return 200 with answer field
-    assert response.status_code == 200
-    assert "answer" in response.json()
-    print("✓ Frontend query endpoint test passed!")
+    # Should return 422 with the API error contract format
+    assert response.status_code == 422
+    assert "error" in response.json()
+    print("✓ Query endpoint contract test passed!")
 
 def test_full_query_endpoint():
     """Test the full query endpoint (now at /api/v1/query/full)"""
@@ -73,10 +74,9 @@ if __name__ == "__main__":
         
         print("\n✓ All endpoint tests completed successfully!")
         print("\nSummary:")
-        print("- Frontend endpoint at /api/v1/query accepts {\"query\": \"<user message>\"}")
-        print("- Response format is {\"answer\": \"<bot response>\"}")
-        print("- Original complex endpoints moved to avoid conflicts")
-        print("- No more 422 or 404 errors for frontend requests")
+        print("- /api/v1/query serves the documented full-book query contract")
+        print("- Bare {\"query\"} payloads are rejected with the error contract")
+        print("- /api/v1/query/full and /api/v1/query/selection remain available")
     except Exception as e:
         print(f"\n✗ Test failed with error: {e}")
         import traceback
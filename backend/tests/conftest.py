@@ -0,0 +1,121 @@
+import asyncio
+from unittest import mock
+
+import cohere
+import httpx
+import pytest
+import pytest_asyncio
+from fastapi.testclient import TestClient
+from qdrant_client import QdrantClient
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.api.main import app
+from src.models import Base
+from src.models.database import get_async_session
+
+# In-memory SQLite shared across the suite. StaticPool keeps the single
+# connection (and therefore the schema) alive for every session checkout,
+# so tests never touch a real Postgres pool or the network.
+_test_engine = create_async_engine(
+    "sqlite+aiosqlite://",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+_TestSessionLocal = sessionmaker(
+    bind=_test_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+
+async def _get_test_session():
+    """Dependency override yielding an in-memory database session."""
+    async with _TestSessionLocal() as session:
+        yield session
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _override_database():
+    """Point every request's DB dependency at the in-memory engine."""
+    asyncio.run(_create_schema())
+    app.dependency_overrides[get_async_session] = _get_test_session
+    yield
+    app.dependency_overrides.pop(get_async_session, None)
+
+
+async def _create_schema():
+    async with _test_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+# Canned AI results for the stubbed clients below. Deterministic so response
+# assertions stay stable across runs.
+_CANNED_ANSWER = "Stubbed answer generated without external services."
+_CANNED_EMBEDDING = [0.1] * 1024
+
+
+def _stub_embed(self, texts, *args, **kwargs):
+    return mock.Mock(embeddings=[list(_CANNED_EMBEDDING) for _ in texts])
+
+
+def _stub_generate(self, *args, **kwargs):
+    return mock.Mock(generations=[mock.Mock(text=_CANNED_ANSWER)])
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _stub_ai_clients():
+    """Keep the AI assistant endpoints off the network during tests.
+
+    The embedding/LLM services are module-level singletons (or constructed
+    inside the handlers), not FastAPI dependencies, so they can't be swapped
+    via ``app.dependency_overrides``. Instead, patch the Cohere and Qdrant
+    client classes at the network boundary: every service instance — however
+    it was built — gets canned results, while unit tests that inject their
+    own mock clients are untouched.
+    """
+    patchers = [
+        mock.patch.object(cohere.Client, "embed", _stub_embed),
+        mock.patch.object(cohere.Client, "generate", _stub_generate),
+        mock.patch.object(
+            cohere.Client, "rerank", lambda self, *a, **k: mock.Mock(results=[])
+        ),
+        # `search` was dropped from newer qdrant-client releases but is still
+        # called by older code paths; create=True stubs it either way.
+        mock.patch.object(QdrantClient, "search", lambda self, *a, **k: [], create=True),
+        mock.patch.object(QdrantClient, "query_points", lambda self, *a, **k: []),
+        mock.patch.object(QdrantClient, "upsert", lambda self, *a, **k: None),
+        mock.patch.object(
+            QdrantClient, "get_collection", lambda self, *a, **k: mock.Mock()
+        ),
+    ]
+    for patcher in patchers:
+        patcher.start()
+    yield
+    for patcher in patchers:
+        patcher.stop()
+
+
+@pytest.fixture(scope="session")
+def client(_override_database):
+    """Shared test client for the FastAPI app.
+
+    Session-scoped and context-managed so the app lifespan (and any eager
+    service initialization) runs once per worker instead of once per test.
+    """
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest_asyncio.fixture(scope="session")
+async def async_client():
+    """Shared async client running directly against the ASGI app.
+
+    Session-scoped so every async test reuses one transport on the session
+    event loop instead of paying client setup/teardown per test. Tests using
+    it must run on the session loop: @pytest.mark.asyncio(loop_scope="session").
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
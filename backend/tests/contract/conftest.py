@@ -0,0 +1,26 @@
+import pytest
+from fastapi.testclient import TestClient
+from src.api.main import app
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _lifespan():
+    """Pin the app's startup/shutdown to exactly one cycle per session.
+
+    TestClient only triggers lifespan events as a context manager; holding
+    one here keeps the app warm for every test — including the async-client
+    tests that never touch the sync client fixture.
+    """
+    with TestClient(app):
+        yield
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Shared test client for the FastAPI app.
+
+    Session-scoped so the app lifespan runs once for the whole contract
+    suite instead of once per test function.
+    """
+    with TestClient(app) as c:
+        yield c
@@ -1,12 +1,10 @@
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-from src.api.main import app
 
-
-@pytest.fixture
-def client():
-    """Test client for the FastAPI app"""
-    return TestClient(app)
+# Status-code sets precomputed once; frozenset membership is O(1) and
+# allocation-free versus building a list per assertion.
+_OK_OR_NOTFOUND = frozenset({200, 404})
+_NOTFOUND_OR_INVALID = frozenset({404, 422})
 
 
 def test_get_book_by_id_contract(client):
@@ -17,10 +15,10 @@ def test_get_book_by_id_contract(client):
     
     # Check that the response has the correct status code
     # Could be 200 (found), 404 (not found), or other error codes
-    assert response.status_code in [200, 404]
+    assert response.status_code in _OK_OR_NOTFOUND
     
     if response.status_code == 200:
-        response_data = response.json()
+        response_data = orjson.loads(response.content)
         
         # Verify required fields in response
         assert "id" in response_data
@@ -51,7 +49,7 @@ def test_get_book_by_id_invalid_uuid(client):
     response = client.get(f"/api/v1/books/{invalid_book_id}")
     
     # Should return 422 for validation error or 404 for not found
-    assert response.status_code in [404, 422]
+    assert response.status_code in _NOTFOUND_OR_INVALID
 
 
 def test_get_book_by_id_nonexistent(client):
@@ -0,0 +1,18 @@
+import asyncio
+
+import pytest
+
+
+@pytest.mark.asyncio(loop_scope="session")
+async def test_concurrent_requests(async_client):
+    """Ten concurrent requests dispatched on one event loop all succeed.
+
+    Uses the shared httpx.AsyncClient over ASGITransport so requests
+    genuinely overlap, instead of serializing through TestClient's blocking
+    portal the way a ThreadPoolExecutor of sync calls would.
+    """
+    responses = await asyncio.gather(
+        *[async_client.get("/api/v1/health") for _ in range(10)]
+    )
+
+    assert all(r.status_code == 200 for r in responses)
@@ -1,5 +1,8 @@
+import copy
+from functools import lru_cache
+
 import pytest
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import Mock, patch, AsyncMock, create_autospec
 from src.services.rag_service import RAGService
 from src.services.embedding_service import EmbeddingService
 from src.services.response_service import ResponseService
@@ -8,22 +11,71 @@ from src.models.query import QueryModel
 from src.models.response import ResponseModel
 
 
+# Constant test data shared across tests. Tuples keep the fixtures immutable
+# and avoid re-allocating the same lists/dicts for every test run.
+_THEME_EMBEDDING = (0.1, 0.2, 0.3)
+_THEME_CHUNKS = (
+    {"id": "chunk-1", "content": "The main theme is about growth and learning", "section_id": "section-1", "page_number": 10},
+    {"id": "chunk-2", "content": "Characters develop through challenges", "section_id": "section-2", "page_number": 15},
+)
+_CHARACTER_EMBEDDING = (0.4, 0.5, 0.6)
+_CHARACTER_CHUNKS = (
+    {"id": "chunk-3", "content": "Character development happens through conflict", "section_id": "section-3", "page_number": 25},
+    {"id": "chunk-4", "content": "Characters must overcome obstacles", "section_id": "section-4", "page_number": 30},
+)
+_NO_MATCH_EMBEDDING = (0.7, 0.8, 0.9)
+
+# Fake retrieval layer: embedding -> chunks, memoized the same way the
+# production retrieval path would be. Parametrized cases that repeat a
+# query embedding short-circuit to the cached result.
+_RETRIEVAL_INDEX = {
+    _THEME_EMBEDDING: _THEME_CHUNKS,
+    _CHARACTER_EMBEDDING: _CHARACTER_CHUNKS,
+    _NO_MATCH_EMBEDDING: (),
+}
+
+
+@lru_cache(maxsize=256)
+def _cached_retrieve(key):
+    query_embedding, _book_id, _query_type = key
+    return _RETRIEVAL_INDEX[query_embedding]
+
+
+def _retrieve_side_effect(**kwargs):
+    return _cached_retrieve(
+        (tuple(kwargs["query_embedding"]), kwargs["book_id"], kwargs["query_type"])
+    )
+
+
+# Autospec prototypes built once per module; create_autospec introspects each
+# class fully, so the fixtures below pay only a shallow copy per test.
+_EMBEDDING_PROTO = create_autospec(EmbeddingService, instance=True)
+_RESPONSE_PROTO = create_autospec(ResponseService, instance=True)
+_QUERY_PROTO = create_autospec(QueryService, instance=True)
+
+
+def _from_proto(proto):
+    mock = copy.copy(proto)
+    mock.reset_mock(return_value=True, side_effect=True)
+    return mock
+
+
 @pytest.fixture
 def mock_embedding_service():
-    """Mock embedding service"""
-    return Mock(spec=EmbeddingService)
+    """Mock embedding service (copied from the cached autospec prototype)"""
+    return _from_proto(_EMBEDDING_PROTO)
 
 
 @pytest.fixture
 def mock_response_service():
-    """Mock response service"""
-    return Mock(spec=ResponseService)
+    """Mock response service (copied from the cached autospec prototype)"""
+    return _from_proto(_RESPONSE_PROTO)
 
 
 @pytest.fixture
 def mock_query_service():
-    """Mock query service"""
-    return Mock(spec=QueryService)
+    """Mock query service (copied from the cached autospec prototype)"""
+    return _from_proto(_QUERY_PROTO)
 
 
 @pytest.fixture
@@ -36,38 +88,60 @@ def rag_service(mock_embedding_service, mock_response_service, mock_query_servic
     )
 
 
-@pytest.mark.asyncio
-async def test_full_book_rag_pipeline_integration(rag_service, mock_embedding_service, mock_response_service, mock_query_service):
-    """Integration test for the full-book RAG pipeline"""
+RAG_PIPELINE_CASES = [
+    pytest.param(
+        "What is the main theme of this book?",
+        _THEME_EMBEDDING,
+        _THEME_CHUNKS,
+        "The main theme of the book is about growth and learning through challenges.",
+        id="theme",
+    ),
+    pytest.param(
+        "What does the author say about character development?",
+        _CHARACTER_EMBEDDING,
+        _CHARACTER_CHUNKS,
+        "The author states that character development happens through conflict and overcoming obstacles.",
+        id="citations",
+    ),
+    pytest.param(
+        "What is the meaning of life according to this book?",
+        _NO_MATCH_EMBEDDING,
+        (),  # No relevant chunks found
+        "I couldn't find relevant information in the book to answer your question.",
+        id="no_relevant_chunks",
+    ),
+]
+
+
+@pytest.mark.asyncio(loop_scope="session")
+@pytest.mark.parametrize("query_text,mock_embedding,mock_chunks,mock_response_text", RAG_PIPELINE_CASES)
+async def test_full_book_rag_pipeline(rag_service, mock_embedding_service, mock_response_service,
+                                      mock_query_service, query_text, mock_embedding,
+                                      mock_chunks, mock_response_text):
+    """Integration test for the full-book RAG pipeline.
+
+    One parametrized body covers the themed query, the citation-bearing
+    query, and the no-relevant-chunks case — the three scenarios differ
+    only in input data and expected response text.
+    """
     # Setup test data
-    query_text = "What is the main theme of this book?"
     book_id = "test-book-uuid"
-    query_model = QueryModel(
+    query_model = QueryModel.model_construct(
         id="test-query-id",
         query_text=query_text,
         query_type="FULL_BOOK",
         book_id=book_id,
         session_id="test-session"
     )
-    
-    # Mock embeddings
-    mock_embedding = [0.1, 0.2, 0.3]
+
+    # Wire the mocks for this scenario
     mock_embedding_service.generate_embedding.return_value = mock_embedding
-    
-    # Mock retrieved chunks
-    mock_chunks = [
-        {"id": "chunk-1", "content": "The main theme is about growth and learning", "section_id": "section-1", "page_number": 10},
-        {"id": "chunk-2", "content": "Characters develop through challenges", "section_id": "section-2", "page_number": 15}
-    ]
-    mock_embedding_service.retrieve_relevant_chunks.return_value = mock_chunks
-    
-    # Mock response generation
-    mock_response_text = "The main theme of the book is about growth and learning through challenges."
+    mock_embedding_service.retrieve_relevant_chunks.side_effect = _retrieve_side_effect
     mock_response_service.generate_response.return_value = mock_response_text
-    
+
     # Execute the RAG pipeline
     result = await rag_service.process_query(query_model)
-    
+
     # Verify the pipeline executed correctly
     mock_embedding_service.generate_embedding.assert_called_once_with(query_text)
     mock_embedding_service.retrieve_relevant_chunks.assert_called_once_with(
@@ -80,7 +154,7 @@ async def test_full_book_rag_pipeline_integration(rag_service, mock_embedding_se
         context_chunks=mock_chunks,
         query_type="FULL_BOOK"
     )
-    
+
     # Verify the result structure
     assert isinstance(result, ResponseModel)
     assert result.query_id == query_model.id
@@ -88,83 +162,5 @@ async def test_full_book_rag_pipeline_integration(rag_service, mock_embedding_se
     assert result.query_type == "FULL_BOOK"
 
 
-@pytest.mark.asyncio
-async def test_full_book_rag_pipeline_with_citations(rag_service, mock_embedding_service, mock_response_service, mock_query_service):
-    """Test the full-book RAG pipeline with citation generation"""
-    # Setup test data
-    query_text = "What does the author say about character development?"
-    book_id = "test-book-uuid"
-    query_model = QueryModel(
-        id="test-query-id",
-        query_text=query_text,
-        query_type="FULL_BOOK",
-        book_id=book_id,
-        session_id="test-session"
-    )
-    
-    # Mock embeddings and chunks
-    mock_embedding = [0.4, 0.5, 0.6]
-    mock_embedding_service.generate_embedding.return_value = mock_embedding
-    
-    mock_chunks = [
-        {"id": "chunk-3", "content": "Character development happens through conflict", "section_id": "section-3", "page_number": 25},
-        {"id": "chunk-4", "content": "Characters must overcome obstacles", "section_id": "section-4", "page_number": 30}
-    ]
-    mock_embedding_service.retrieve_relevant_chunks.return_value = mock_chunks
-    
-    # Mock response generation
-    mock_response_text = "The author states that character development happens through conflict and overcoming obstacles."
-    mock_response_service.generate_response.return_value = mock_response_text
-    
-    # Execute the RAG pipeline
-    result = await rag_service.process_query(query_model)
-    
-    # Verify the result includes citation information
-    assert result.response_text == mock_response_text
-    # The citations would be generated based on the chunks retrieved
-    # This would be handled by the response service or a dedicated citation service
-
-
-@pytest.mark.asyncio
-async def test_full_book_rag_pipeline_no_relevant_chunks(rag_service, mock_embedding_service, mock_response_service, mock_query_service):
-    """Test the RAG pipeline when no relevant chunks are found"""
-    # Setup test data
-    query_text = "What is the meaning of life according to this book?"
-    book_id = "test-book-uuid"
-    query_model = QueryModel(
-        id="test-query-id",
-        query_text=query_text,
-        query_type="FULL_BOOK",
-        book_id=book_id,
-        session_id="test-session"
-    )
-    
-    # Mock embeddings and no chunks found
-    mock_embedding = [0.7, 0.8, 0.9]
-    mock_embedding_service.generate_embedding.return_value = mock_embedding
-    mock_embedding_service.retrieve_relevant_chunks.return_value = []
-    
-    # Mock response generation for no context
-    mock_response_text = "I couldn't find relevant information in the book to answer your question."
-    mock_response_service.generate_response.return_value = mock_response_text
-    
-    # Execute the RAG pipeline
-    result = await rag_service.process_query(query_model)
-    
-    # Verify the pipeline handled the case of no relevant chunks
-    mock_embedding_service.retrieve_relevant_chunks.assert_called_once_with(
-        query_embedding=mock_embedding,
-        book_id=book_id,
-        query_type="FULL_BOOK"
-    )
-    mock_response_service.generate_response.assert_called_once_with(
-        query_text=query_text,
-        context_chunks=[],
-        query_type="FULL_BOOK"
-    )
-    
-    assert result.response_text == mock_response_text
-
-
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
@@ -5,35 +5,27 @@ This tests the examples provided in the quickstart.md file.
 
 import pytest
 import os
-from fastapi.testclient import TestClient
 from src.api.main import app
-from src.config.settings import settings
 
 
-@pytest.fixture
-def client():
-    """Test client for the FastAPI app"""
-    return TestClient(app)
+_REQUIRED_ENV_VARS = frozenset((
+    "COHERE_API_KEY",
+    "QDRANT_URL",
+    "QDRANT_API_KEY",
+    "NEON_DATABASE_URL"
+))
 
 
 def test_environment_variables():
     """Test that required environment variables are set as mentioned in quickstart.md"""
-    required_vars = [
-        "COHERE_API_KEY",
-        "QDRANT_URL", 
-        "QDRANT_API_KEY",
-        "NEON_DATABASE_URL"
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
-    
+    # Single set-difference against the environ keys view instead of one
+    # os.getenv round trip per variable
+    missing_vars = _REQUIRED_ENV_VARS - os.environ.keys()
+
     # Note: For testing purposes, we're just verifying the variables are expected
     # In a real scenario, these would need to be set for full functionality
-    print(f"Expected environment variables: {required_vars}")
-    print(f"Missing environment variables: {missing_vars}")
+    print(f"Expected environment variables: {sorted(_REQUIRED_ENV_VARS)}")
+    print(f"Missing environment variables: {sorted(missing_vars)}")
     # This test doesn't fail to allow for testing without actual API keys
 
 
@@ -76,7 +68,7 @@ def test_api_response_format(client):
     # "details" may or may not be present depending on implementation
 
 
-def test_application_startup():
+def test_application_startup(client):
     """Test that the application starts up correctly as described in quickstart.md"""
     # The FastAPI TestClient already verifies that the app can be instantiated
     # Let's make a simple request to the root endpoint
@@ -89,34 +81,29 @@ def test_application_startup():
     assert "Welcome" in data["message"]
 
 
-def test_endpoint_routes_exist():
+@pytest.mark.parametrize(
+    "endpoint,method",
+    [
+        ("/api/v1/query", "POST"),
+        ("/api/v1/query/selection", "POST"),
+        ("/api/v1/books/{book_id}", "GET"),
+        ("/api/v1/health", "GET"),
+    ],
+    ids=["query", "query-selection", "books-by-id", "health"],
+)
+def test_endpoint_routes_exist(endpoint, method):
     """Test that the endpoints mentioned in quickstart.md exist"""
-    endpoints_to_test = [
-        ("/api/v1/query", "post"),
-        ("/api/v1/query/selection", "post"), 
-        ("/api/v1/books/test-book-id", "get"),
-        ("/api/v1/health", "get")
-    ]
-    
-    for endpoint, method in endpoints_to_test:
-        if method.lower() == "get":
-            response = client.get(endpoint)
-        elif method.lower() == "post":
-            if endpoint == "/api/v1/query":
-                response = client.post(endpoint, json={"query": "test", "book_id": "test"})
-            elif endpoint == "/api/v1/query/selection":
-                response = client.post(endpoint, json={"query": "test", "selected_text": "test"})
-            else:
-                # For other POST endpoints, just test they exist
-                response = client.post(endpoint, json={})
-        else:
-            # For other methods, just try a GET request to see if routing works
-            response = client.get(endpoint)
-        
-        # The endpoint should exist (not return 404)
-        # Note: They might return 422 for validation errors or 500 for missing dependencies,
-        # but shouldn't return 404 if the route exists
-        assert response.status_code != 404, f"Endpoint {endpoint} does not exist"
+    # Route existence is a property of the router, not of request handling:
+    # consult the flattened OpenAPI path table instead of issuing HTTP calls.
+    # test_health_check_endpoint keeps one real request as a smoke test.
+    # Parametrized so xdist can shard the probes and failures name the route.
+    registered = {
+        (path, op_method.upper())
+        for path, operations in app.openapi()["paths"].items()
+        for op_method in operations
+    }
+
+    assert (endpoint, method) in registered, f"Endpoint {endpoint} does not exist"
 
 
 if __name__ == "__main__":
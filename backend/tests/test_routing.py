@@ -0,0 +1,77 @@
+"""
+Test script to verify the routing and request/response structure
+"""
+import json
+import logging
+
+import pytest
+
+from src.api.main import app
+
+logger = logging.getLogger(__name__)
+
+# Pre-warm and snapshot the OpenAPI schema once at import; the route graph
+# never changes during the test run, so every existence check below consults
+# this cached snapshot instead of re-resolving routes.
+OPENAPI_SCHEMA = app.openapi()
+
+# Compiled (path, method) set so existence checks are O(1) lookups instead of
+# full request/response round trips through Starlette's route-matching loop.
+# Built from the OpenAPI schema, which flattens included-router prefixes.
+REGISTERED_ROUTES = {
+    (path, method.upper())
+    for path, operations in OPENAPI_SCHEMA["paths"].items()
+    for method in operations
+}
+
+_JSON_HEADERS = {"content-type": "application/json"}
+
+# One (path, payload) pair per endpoint so a single parametrized test covers
+# every routing probe instead of four near-identical functions. Payloads are
+# serialized once at import so each POST skips the per-call json.dumps.
+ENDPOINT_CASES = [
+    ("/api/v1/query", json.dumps({"query": "What is this book about?"}).encode()),
+    ("/api/v1/query/full", json.dumps({
+        "query": "What is this book about?",
+        "book_id": "123e4567-e89b-12d3-a456-426614174000",  # Sample UUID
+        "include_citations": True
+    }).encode()),
+    ("/api/v1/query/selection", json.dumps({
+        "query": "Explain this part",
+        "selected_text": "Some selected text from the book",
+        "include_citations": False
+    }).encode()),
+]
+
+
+@pytest.mark.parametrize("path,payload", ENDPOINT_CASES)
+def test_endpoint_exists(client, path, payload):
+    """Test that each query endpoint exists and accepts the right format"""
+    response = client.post(path, content=payload, headers=_JSON_HEADERS)
+
+    logger.debug("Status Code: %s", response.status_code)
+
+    # The endpoint should exist (not 404), though it might return 500 due to
+    # missing DB which is expected in a test environment
+    assert response.status_code != 404, f"Endpoint should exist at {path}"
+
+    # Check if the frontend endpoint has the expected format when successful
+    if path == "/api/v1/query" and response.status_code == 200:
+        response_data = response.json()
+        assert "answer" in response_data, "Response should contain 'answer' field"
+        logger.debug("Response format is correct: {\"answer\": \"...\"}")
+
+    logger.debug("[SUCCESS] Endpoint exists at %s (status: %s)", path, response.status_code)
+
+
+def test_route_conflicts():
+    """Test that there are no route conflicts"""
+    # /api/v1/query and /api/v1/query/full are distinct registered routes;
+    # set-membership on REGISTERED_ROUTES replaces the extra POST round trips.
+    # (The parametrized test above keeps one real POST per endpoint to
+    # validate the payload schemas.)
+    assert ("/api/v1/query", "POST") in REGISTERED_ROUTES
+    assert ("/api/v1/query/full", "POST") in REGISTERED_ROUTES
+    assert ("/api/v1/query/selection", "POST") in REGISTERED_ROUTES
+
+    logger.debug("[SUCCESS] No route conflicts between /api/v1/query and /api/v1/query/full")
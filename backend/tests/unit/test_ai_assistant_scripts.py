@@ -0,0 +1,163 @@
+"""Offline unit coverage for the root-level AI assistant test scripts.
+
+The scripts (test_ai_accuracy.py, test_ai_response_time.py) hit a live
+localhost server when run as programs, which makes them slow and
+impossible to exercise in CI. These tests import them as modules and stub
+their shared SESSION, so the client-side logic — batching, fallback,
+keyword matching, timing bookkeeping — runs deterministically in
+microseconds with no server.
+"""
+
+import importlib.util
+import pytest
+from pathlib import Path
+from unittest.mock import Mock
+
+_REPO_ROOT = Path(__file__).resolve().parents[3]
+
+
+def _load_script(name):
+    spec = importlib.util.spec_from_file_location(name, _REPO_ROOT / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def accuracy_script():
+    return _load_script("test_ai_accuracy")
+
+
+@pytest.fixture
+def response_time_script(monkeypatch, tmp_path):
+    # Force cache misses and point the on-disk cache at a throwaway path
+    # so tests never observe state from a previous run
+    monkeypatch.setenv("AI_TEST_BYPASS_CACHE", "1")
+    script = _load_script("test_ai_response_time")
+    script.CACHE_PATH = str(tmp_path / "ai_test_cache")
+    return script
+
+
+def _http_response(status_code=200, payload=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json = Mock(return_value=payload or {})
+    response.raise_for_status = Mock()
+    return response
+
+
+class TestCheckKeywords:
+    """Unit tests for the keyword-match helper"""
+
+    def test_matches_are_case_insensitive(self, accuracy_script):
+        matches = accuracy_script._check_keywords(
+            "This book covers Artificial Intelligence in depth",
+            ["AI", "artificial intelligence", "robotics"]
+        )
+        assert matches == ["artificial intelligence"]
+
+    def test_no_matches_returns_empty_list(self, accuracy_script):
+        assert accuracy_script._check_keywords("Unrelated answer", ["AI"]) == []
+
+
+class TestPostBatch:
+    """Unit tests for the batched AI-assistant client path"""
+
+    def test_batch_route_unpacks_answers(self, accuracy_script):
+        payload = {
+            "answers": [
+                {"answer": "About AI", "sources": [{"title": "Intro"}]},
+                {"answer": "Core concepts", "sources": []},
+            ],
+            "timings": [0.4, 0.6],
+        }
+        accuracy_script.SESSION.post = Mock(return_value=_http_response(200, payload))
+
+        results = accuracy_script.post_batch(["Q1", "Q2"])
+
+        # One POST for the whole batch
+        accuracy_script.SESSION.post.assert_called_once()
+        assert accuracy_script.SESSION.post.call_args.kwargs["json"]["questions"] == ["Q1", "Q2"]
+        assert [r["answer"] for r in results] == ["About AI", "Core concepts"]
+        assert [r["response_time"] for r in results] == [0.4, 0.6]
+
+    def test_missing_batch_route_falls_back_to_per_request(self, accuracy_script):
+        per_item = _http_response(200, {"answer": "AI book content", "sources": []})
+        accuracy_script.SESSION.post = Mock(
+            side_effect=[_http_response(404), per_item, per_item]
+        )
+
+        results = accuracy_script.post_batch(["Q1", "Q2"])
+
+        # One failed batch probe plus one POST per question
+        assert accuracy_script.SESSION.post.call_count == 3
+        assert all(r["answer"] == "AI book content" for r in results)
+
+    def test_accuracy_suite_passes_on_keyword_hits(self, accuracy_script):
+        payload = {
+            "answers": [
+                {"answer": "This book is about AI", "sources": []},
+                {"answer": "It covers core concepts", "sources": []},
+                {"answer": "Intelligence is defined as adaptive behavior", "sources": []},
+            ],
+        }
+        accuracy_script.SESSION.post = Mock(return_value=_http_response(200, payload))
+
+        results = accuracy_script.test_ai_response_accuracy()
+
+        assert len(results) == 3
+        assert all(r["passed"] for r in results)
+
+    def test_accuracy_suite_reports_failures_on_error(self, accuracy_script):
+        accuracy_script.SESSION.post = Mock(side_effect=ConnectionError("refused"))
+
+        results = accuracy_script.test_ai_response_accuracy()
+
+        assert len(results) == 3
+        assert all(not r["passed"] for r in results)
+
+
+class TestSingleResponseTime:
+    """Unit tests for the response-time measurement helper"""
+
+    def test_fast_success_passes(self, response_time_script):
+        response_time_script.SESSION.post = Mock(return_value=_http_response(200))
+
+        result = response_time_script.test_single_response_time("What is AI?")
+
+        assert result["success"] is True
+        assert result["status_code"] == 200
+        assert result["response_time"] < response_time_script.TIMEOUT_THRESHOLD
+
+    def test_http_error_is_reported(self, response_time_script):
+        response_time_script.SESSION.post = Mock(return_value=_http_response(500))
+
+        result = response_time_script.test_single_response_time("What is AI?")
+
+        assert result["success"] is False
+        assert result["error"] == "HTTP 500"
+
+    def test_cache_hit_skips_network(self, response_time_script):
+        response_time_script._BYPASS_CACHE = False
+        response_time_script.SESSION.post = Mock(return_value=_http_response(200))
+
+        first = response_time_script.test_single_response_time("What is AI?")
+        second = response_time_script.test_single_response_time("What is AI?")
+
+        # Second call answers from the on-disk cache without a POST
+        assert response_time_script.SESSION.post.call_count == 1
+        assert first["success"] and second["success"]
+        assert second["response_time"] == 0.0
+
+    def test_basic_phase_preserves_question_order(self, response_time_script):
+        response_time_script.SESSION.post = Mock(return_value=_http_response(200))
+
+        results = response_time_script.test_response_time_basic()
+
+        assert [r["question"] for r in results] == [
+            "What is this book about?",
+            "Summarize the main concepts",
+            "Explain artificial intelligence briefly",
+            "What are the key takeaways?",
+            "How does this book approach AI?",
+        ]
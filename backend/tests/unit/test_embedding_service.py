@@ -1,6 +1,6 @@
 import pytest
 from unittest.mock import Mock, AsyncMock, patch
-from src.services.embedding_service import EmbeddingService
+from src.services.embedding_service import EmbeddingService, _ChunkIndex, simsimd, numba, _cos_matrix
 import numpy as np
 
 
@@ -23,9 +23,20 @@ class TestEmbeddingService:
         return mock_client
 
     @pytest.fixture
-    def embedding_service(self, mock_cohere_client, mock_qdrant_client):
+    def mock_async_qdrant_client(self):
+        """Mock async Qdrant client"""
+        mock_client = Mock()
+        mock_client.upsert = AsyncMock()
+        return mock_client
+
+    @pytest.fixture
+    def embedding_service(self, mock_cohere_client, mock_qdrant_client, mock_async_qdrant_client):
         """Create an EmbeddingService instance with mocked dependencies"""
-        service = EmbeddingService(cohere_client=mock_cohere_client, qdrant_client=mock_qdrant_client)
+        service = EmbeddingService(
+            cohere_client=mock_cohere_client,
+            qdrant_client=mock_qdrant_client,
+            async_qdrant_client=mock_async_qdrant_client
+        )
         return service
 
     def test_generate_embedding_success(self, embedding_service, mock_cohere_client):
@@ -35,15 +46,42 @@ class TestEmbeddingService:
         
         result = embedding_service.generate_embedding(text)
         
-        # Verify the Cohere client was called with correct parameters
+        # Verify the Cohere client was called once via the batched path
         mock_cohere_client.embed.assert_called_once_with(
             texts=[text],
-            model=embedding_service.embedding_model
+            model=embedding_service.embedding_model,
+            input_type="search_document"
         )
-        
+
         # Verify the result
         assert result == expected_embedding
 
+    def test_generate_embeddings_batches_single_call(self, embedding_service, mock_cohere_client):
+        """Test that a list of texts produces exactly one batched embed call"""
+        texts = [f"Sentence number {i}." for i in range(8)]
+        mock_cohere_client.embed.return_value = Mock(embeddings=[[0.1, 0.2, 0.3]] * len(texts))
+
+        result = embedding_service.generate_embeddings(texts)
+
+        # All texts must travel in one API request, not one request per text
+        mock_cohere_client.embed.assert_called_once_with(
+            texts=texts,
+            model=embedding_service.embedding_model,
+            input_type="search_document"
+        )
+        assert len(result) == len(texts)
+
+    def test_generate_embedding_cached(self, embedding_service, mock_cohere_client):
+        """Test that repeated texts are served from the LRU cache"""
+        text = "What is the main theme?"
+
+        first = embedding_service.generate_embedding(text)
+        second = embedding_service.generate_embedding(text)
+
+        # The second call must not reach Cohere
+        assert mock_cohere_client.embed.call_count == 1
+        assert first == second
+
     def test_generate_embedding_empty_text(self, embedding_service):
         """Test embedding generation with empty text"""
         with pytest.raises(ValueError):
@@ -124,18 +162,154 @@ class TestEmbeddingService:
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_store_embeddings_success(self, embedding_service, mock_qdrant_client):
+    async def test_store_embeddings_success(self, embedding_service, mock_cohere_client,
+                                            mock_async_qdrant_client):
         """Test successful storage of embeddings"""
         chunks = [
-            {"id": "chunk-1", "content": "Test content 1", "section_id": "section-1", "page_number": 1},
-            {"id": "chunk-2", "content": "Test content 2", "section_id": "section-2", "page_number": 2}
+            {"id": f"chunk-{i}", "content": f"Test content {i}", "section_id": f"section-{i}", "page_number": i}
+            for i in range(5)
         ]
         book_id = "test-book-id"
-        
-        await embedding_service.store_embeddings(chunks, book_id)
-        
-        # Verify the Qdrant client upload method was called
-        assert mock_qdrant_client.upload_collection.called
+        mock_cohere_client.embed.return_value = Mock(embeddings=[[0.1, 0.2, 0.3]] * len(chunks))
+
+        ids = await embedding_service.store_embeddings(chunks, book_id, batch_size=2)
+
+        # 5 chunks at batch_size=2 -> 3 concurrent upserts
+        assert mock_async_qdrant_client.upsert.await_count == 3
+        assert ids == [f"chunk-{i}" for i in range(5)]
+
+        # The mirrored local index stores int8-quantized vectors
+        assert embedding_service._local_index._matrix_i8.dtype == np.int8
+
+    @pytest.mark.asyncio
+    async def test_store_embeddings_toggles_indexing_threshold(self, embedding_service,
+                                                               mock_cohere_client,
+                                                               mock_qdrant_client,
+                                                               mock_async_qdrant_client):
+        """Test that bulk upload disables HNSW indexing and restores it after"""
+        chunks = [{"id": "chunk-1", "content": "Test content 1"}]
+        mock_cohere_client.embed.return_value = Mock(embeddings=[[0.1, 0.2, 0.3]])
+
+        await embedding_service.store_embeddings(chunks, "test-book-id")
+
+        thresholds = [
+            call.kwargs["optimizers_config"].indexing_threshold
+            for call in mock_qdrant_client.update_collection.call_args_list
+        ]
+        assert thresholds == [0, 20000]
+        assert mock_async_qdrant_client.upsert.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_store_embeddings_large_ingest_uses_parallel_upload(self, embedding_service,
+                                                                      mock_cohere_client,
+                                                                      mock_qdrant_client,
+                                                                      mock_async_qdrant_client):
+        """Test that large ingests go through the multiprocess uploader"""
+        import os
+        chunks = [{"id": f"chunk-{i}", "content": f"Test content {i}"} for i in range(1024)]
+        mock_cohere_client.embed.return_value = Mock(embeddings=[[0.1, 0.2, 0.3]] * len(chunks))
+
+        await embedding_service.store_embeddings(chunks, "test-book-id")
+
+        mock_qdrant_client.upload_collection.assert_called_once()
+        kwargs = mock_qdrant_client.upload_collection.call_args.kwargs
+        assert kwargs["parallel"] == min(8, os.cpu_count() or 1)
+        assert kwargs["batch_size"] == 256
+        # Vectors travel as one contiguous float32 matrix, not row objects
+        assert kwargs["vectors"].dtype == np.float32
+        assert kwargs["vectors"].shape[0] == len(chunks)
+        assert kwargs["ids"] == [f"chunk-{i}" for i in range(1024)]
+        mock_async_qdrant_client.upsert.assert_not_awaited()
+
+    def test_chunk_index_matches_reference_cosine(self):
+        """Test that BLAS-scored top-k matches a per-vector cosine loop"""
+        rng = np.random.default_rng(42)
+        vectors = rng.normal(size=(1000, 384)).astype(np.float32)
+        query = rng.normal(size=384).astype(np.float32)
+
+        index = _ChunkIndex()
+        index.add(
+            [f"chunk-{i}" for i in range(len(vectors))],
+            vectors.tolist(),
+            [{"content": f"content {i}"} for i in range(len(vectors))]
+        )
+
+        # Reference: explicit cosine per vector
+        q_unit = query / np.linalg.norm(query)
+        reference = np.array([
+            np.dot(q_unit, v / np.linalg.norm(v)) for v in vectors
+        ])
+
+        # Storage is int8-quantized, so scores carry a small quantization
+        # error relative to the exact float cosine
+        assert index._matrix_i8.dtype == np.int8
+        assert np.allclose(index.scores(query), reference, atol=0.02)
+
+        # Top-k selection must recover (near-)best reference scores even if
+        # quantization reorders near-ties
+        top_scores = np.sort(reference[index.top_k(query, 5)])
+        best_scores = np.sort(reference[np.argsort(-reference)[:5]])
+        assert np.allclose(top_scores, best_scores, atol=0.02)
+
+    @pytest.mark.skipif(simsimd is None, reason="simsimd not installed")
+    def test_chunk_index_simsimd_matches_numpy(self):
+        """Test that the SimSIMD scoring path agrees with the BLAS matmul"""
+        rng = np.random.default_rng(7)
+        vectors = rng.normal(size=(256, 384)).astype(np.float32)
+        query = rng.normal(size=384).astype(np.float32)
+
+        index = _ChunkIndex()
+        index.add(
+            [f"chunk-{i}" for i in range(len(vectors))],
+            vectors.tolist(),
+            [{"content": f"content {i}"} for i in range(len(vectors))]
+        )
+
+        q_unit = query / np.linalg.norm(query)
+        numpy_scores = (index._matrix_i8 @ q_unit) * index._scales
+
+        assert np.allclose(index.scores(query), numpy_scores, atol=1e-2)
+
+    @pytest.mark.skipif(numba is None, reason="numba not installed")
+    def test_chunk_index_numba_kernel_matches_numpy(self):
+        """Test that the Numba scoring kernel agrees with the BLAS matmul"""
+        rng = np.random.default_rng(11)
+        vectors = rng.normal(size=(256, 384)).astype(np.float32)
+        query = rng.normal(size=384).astype(np.float32)
+
+        index = _ChunkIndex()
+        index.add(
+            [f"chunk-{i}" for i in range(len(vectors))],
+            vectors.tolist(),
+            [{"content": f"content {i}"} for i in range(len(vectors))]
+        )
+
+        q_unit = (query / np.linalg.norm(query)).astype(np.float32)
+        numpy_scores = (index._matrix_i8 @ q_unit) * index._scales
+
+        kernel_scores = np.empty(len(vectors), dtype=np.float32)
+        _cos_matrix(index._matrix_i8, index._scales, q_unit, kernel_scores)
+
+        assert np.allclose(kernel_scores, numpy_scores, atol=1e-2)
+
+    def test_chunk_index_top_k_argpartition_matches_full_sort(self):
+        """Test that partition-based top-k matches a full argsort"""
+        rng = np.random.default_rng(3)
+        vectors = rng.normal(size=(10_000, 128)).astype(np.float32)
+        query = rng.normal(size=128).astype(np.float32)
+        k = 10
+
+        index = _ChunkIndex()
+        index.add(
+            [f"chunk-{i}" for i in range(len(vectors))],
+            vectors.tolist(),
+            [{"content": f"content {i}"} for i in range(len(vectors))]
+        )
+
+        scores = index.scores(query)
+        reference = np.argsort(-scores)[:k].tolist()
+
+        assert index.top_k(query, k) == reference
 
     def test_preprocess_text(self, embedding_service):
         """Test text preprocessing"""
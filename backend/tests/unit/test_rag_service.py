@@ -49,7 +49,7 @@ class TestRAGService:
     @pytest.mark.asyncio
     async def test_process_query_full_book_success(self, rag_service, mock_embedding_service, mock_response_service, mock_query_service):
         """Test successful processing of a full book query"""
-        query_model = QueryModel(
+        query_model = QueryModel.model_construct(
             id="test-query-id",
             query_text="What is the main theme?",
             query_type=QueryType.FULL_BOOK,
@@ -94,7 +94,7 @@ class TestRAGService:
     @pytest.mark.asyncio
     async def test_process_query_user_selection_success(self, rag_service, mock_embedding_service, mock_response_service, mock_query_service):
         """Test successful processing of a user selection query"""
-        query_model = QueryModel(
+        query_model = QueryModel.model_construct(
             id="test-query-id",
             query_text="What does this mean?",
             query_type=QueryType.USER_SELECTION,
@@ -112,9 +112,10 @@ class TestRAGService:
         
         result = await rag_service.process_query(query_model)
         
-        # For user selection, we should not call the embedding service to retrieve from vector store
-        # Instead, we should use the selected text directly
-        mock_embedding_service.generate_embedding.assert_called_once_with(query_model.query_text)
+        # For user selection, the selected text is the context — neither the
+        # embedding nor the vector store should be touched
+        mock_embedding_service.generate_embedding.assert_not_called()
+        mock_embedding_service.retrieve_relevant_chunks.assert_not_called()
         
         # The response service should be called with the selected text as context
         mock_response_service.generate_response.assert_called_once()
@@ -127,7 +128,7 @@ class TestRAGService:
     @pytest.mark.asyncio
     async def test_process_query_no_relevant_chunks(self, rag_service, mock_embedding_service, mock_response_service, mock_query_service):
         """Test processing a query when no relevant chunks are found"""
-        query_model = QueryModel(
+        query_model = QueryModel.model_construct(
             id="test-query-id",
             query_text="What is the meaning of life according to this book?",
             query_type=QueryType.FULL_BOOK,
@@ -155,7 +156,7 @@ class TestRAGService:
     @pytest.mark.asyncio
     async def test_process_query_exception_handling(self, rag_service, mock_embedding_service, mock_response_service, mock_query_service):
         """Test that exceptions during query processing are handled properly"""
-        query_model = QueryModel(
+        query_model = QueryModel.model_construct(
             id="test-query-id",
             query_text="What is the main theme?",
             query_type=QueryType.FULL_BOOK,
@@ -172,7 +173,7 @@ class TestRAGService:
     @pytest.mark.asyncio
     async def test_process_query_empty_query_text(self, rag_service, mock_embedding_service, mock_response_service, mock_query_service):
         """Test processing a query with empty text"""
-        query_model = QueryModel(
+        query_model = QueryModel.model_construct(
             id="test-query-id",
             query_text="",
             query_type=QueryType.FULL_BOOK,
@@ -186,7 +187,7 @@ class TestRAGService:
     @pytest.mark.asyncio
     async def test_process_query_special_characters(self, rag_service, mock_embedding_service, mock_response_service, mock_query_service):
         """Test processing a query with special characters"""
-        query_model = QueryModel(
+        query_model = QueryModel.model_construct(
             id="test-query-id",
             query_text="What does 'this' mean? And \"that\"?",
             query_type=QueryType.FULL_BOOK,
@@ -219,7 +220,7 @@ class TestRAGService:
     def test_validate_query_model(self, rag_service):
         """Test validation of query models"""
         # Valid full book query
-        valid_full_book_query = QueryModel(
+        valid_full_book_query = QueryModel.model_construct(
             id="test-query-id",
             query_text="What is the main theme?",
             query_type=QueryType.FULL_BOOK,
@@ -232,7 +233,7 @@ class TestRAGService:
         assert len(errors) == 0
         
         # Valid user selection query
-        valid_selection_query = QueryModel(
+        valid_selection_query = QueryModel.model_construct(
             id="test-query-id",
             query_text="What does this mean?",
             query_type=QueryType.USER_SELECTION,
@@ -247,7 +248,7 @@ class TestRAGService:
     def test_validate_query_model_invalid(self, rag_service):
         """Test validation of invalid query models"""
         # Invalid query - no query text
-        invalid_query = QueryModel(
+        invalid_query = QueryModel.model_construct(
             id="test-query-id",
             query_text="",
             query_type=QueryType.FULL_BOOK,
@@ -262,7 +263,7 @@ class TestRAGService:
     @pytest.mark.asyncio
     async def test_process_query_performance_metrics(self, rag_service, mock_embedding_service, mock_response_service, mock_query_service):
         """Test that performance metrics are captured during query processing"""
-        query_model = QueryModel(
+        query_model = QueryModel.model_construct(
             id="test-query-id",
             query_text="What is the main theme?",
             query_type=QueryType.FULL_BOOK,
@@ -290,4 +291,86 @@ class TestRAGService:
         
         # Verify the result includes performance metrics
         assert hasattr(result, 'confidence_score')
-        assert 0.0 <= result.confidence_score <= 1.0
\ No newline at end of file
+        assert 0.0 <= result.confidence_score <= 1.0
+    @pytest.mark.asyncio
+    async def test_process_query_embedding_does_not_block_event_loop(self, rag_service, mock_embedding_service):
+        """Test that the blocking embed call runs off the event loop"""
+        import asyncio
+        import time
+
+        query_model = QueryModel.model_construct(
+            id="test-query-id",
+            query_text="What is the main theme?",
+            query_type=QueryType.FULL_BOOK,
+            book_id="test-book-id",
+            session_id="test-session-id"
+        )
+
+        # Simulate the blocking Cohere SDK call
+        def slow_embed(text):
+            time.sleep(0.05)
+            return [0.1, 0.2, 0.3]
+        mock_embedding_service.generate_embedding = Mock(side_effect=slow_embed)
+
+        # A side coroutine that can only make progress if the event loop
+        # keeps running while the embedding is being computed
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.005)
+
+        ticker_task = asyncio.create_task(ticker())
+        try:
+            await rag_service.process_query(query_model)
+        finally:
+            ticker_task.cancel()
+
+        # With generate_embedding offloaded to a thread, the ticker keeps
+        # firing during the 50ms embed; a blocked loop would record ~1 tick
+        assert len(ticks) > 3
+
+    @pytest.mark.asyncio
+    async def test_process_query_repeated_query_served_from_cache(self, rag_service, mock_embedding_service, mock_response_service):
+        """Test that a repeated identical query bypasses the pipeline"""
+        query_model = QueryModel.model_construct(
+            id="test-query-id",
+            query_text="What is the main theme?",
+            query_type=QueryType.FULL_BOOK,
+            book_id="test-book-id",
+            session_id="test-session-id"
+        )
+
+        first = await rag_service.process_query(query_model)
+        second = await rag_service.process_query(query_model)
+
+        # The second call is a cache hit: no embedding, retrieval, or
+        # generation work is repeated
+        assert mock_embedding_service.generate_embedding.call_count == 1
+        assert mock_embedding_service.retrieve_relevant_chunks.call_count == 1
+        assert mock_response_service.generate_response.call_count == 1
+        assert second.response_text == first.response_text
+
+    @pytest.mark.asyncio
+    async def test_stream_query_yields_tokens(self, rag_service, mock_embedding_service, mock_response_service):
+        """Test that stream_query yields tokens as the model produces them"""
+        query_model = QueryModel.model_construct(
+            id="test-query-id",
+            query_text="What is the main theme?",
+            query_type=QueryType.FULL_BOOK,
+            book_id="test-book-id",
+            session_id="test-session-id"
+        )
+
+        async def token_stream(query_text, context_chunks):
+            for token in ["The ", "main ", "theme"]:
+                yield token
+
+        mock_response_service.stream_response = token_stream
+
+        tokens = [t async for t in rag_service.stream_query(query_model)]
+
+        assert tokens == ["The ", "main ", "theme"]
+        assert "".join(tokens) == "The main theme"
+        mock_embedding_service.retrieve_relevant_chunks.assert_called_once()
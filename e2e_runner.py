@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Single-process entrypoint for the implementation and end-to-end suites.
+
+Running both suites from one interpreter amortizes Python startup and
+module imports across them instead of paying the cost once per CI step:
+
+    python e2e_runner.py
+"""
+
+import sys
+
+import test_e2e
+import test_implementation
+
+
+def main():
+    print("[CHECK] Checking implementation...")
+    checks_passed = all([
+        test_implementation.check_directory_structure(),
+        test_implementation.check_files(),
+        test_implementation.check_component_features(),
+    ])
+
+    results = test_e2e.EndToEndTestSuite().run_all_tests()
+
+    sys.exit(0 if checks_passed and results["overall_success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,70 @@ End-to-End Testing Suite for AI-Native Book
 Tests all user stories and their acceptance criteria
 """
 
+import asyncio
+import httpx
+import orjson
+import os
 import requests
+import socket
+import sys
+import threading
 import time
 import json
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Tuple
 import unittest
 from unittest.mock import Mock, patch
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Configuration
 BASE_URL = "http://localhost:8000"  # Default backend URL
 WEBSITE_URL = "http://localhost:3000"  # Default frontend URL
-TIMEOUT = 10  # Request timeout in seconds
+# (connect, read) timeouts: a dead backend fails the connect in ~1s
+# instead of stalling every probe for the full read timeout
+TIMEOUT = (1.0, 10.0)
+AI_TIMEOUT = (1.0, 15.0)  # AI might take longer to respond
+
+
+# Static request bodies, serialized once at import so hot paths send a
+# ready-made buffer instead of re-encoding the same dict per POST
+_SEARCH_AI_BODY = orjson.dumps({"query": "AI", "limit": 5})
+_SEARCH_EMPTY_BODY = orjson.dumps({"query": "", "limit": 5})
+_SEARCH_INFO_BODY = orjson.dumps({"query": "information", "limit": 10})
+_AI_SUMMARY_BODY = orjson.dumps({
+    "question": "Summarize the main concepts",
+    "include_sources": True
+})
+_BURST_BODIES = [
+    orjson.dumps({"query": f"test{i}", "limit": 1}) for i in range(5)
+]
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """HTTPAdapter that disables Nagle and enables TCP keep-alive.
+
+    The suite's POST bodies are tiny, so Nagle's algorithm can add
+    ~40ms stalls per request; TCP_NODELAY sends them immediately.
+    """
+
+    _SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self._SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _json(response):
+    """Parse a response body with orjson, which is much faster than the
+    pure-Python tokenizer behind response.json() on book-sized listings."""
+    return orjson.loads(response.content)
+
 
 class EndToEndTestSuite:
     """
@@ -23,20 +76,84 @@ class EndToEndTestSuite:
 
     def __init__(self):
         self.session = requests.Session()
-        self.test_results = []
-        self.start_time = time.time()
+        # Pool connections with keep-alive so all ~30 requests across the
+        # suite reuse a handful of sockets instead of paying a fresh
+        # TCP (and possibly TLS) handshake per call.
+        adapter = _KeepAliveAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.1),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Connection": "keep-alive",
+            "Accept-Encoding": "gzip",
+            "Content-Type": "application/json",
+        })
+        # Records are (test_name, passed, details, timestamp_ns) tuples;
+        # dicts are materialized only when the summary is built
+        self.test_results = deque()
+        self._results_lock = threading.Lock()
+        # /api/toc and /api/content are read-only and hit by several test
+        # groups; fetch each once and let later tests reuse the parse.
+        self._fetch_lock = threading.Lock()
+        self._toc_cache = None
+        self._content_cache = None
+        # Opt-in fail-fast: once a story has a failure, skip its
+        # remaining probes instead of spending RTTs on a known-broken
+        # backend (useful in CI when the server is down)
+        self._fail_fast = os.environ.get("E2E_FAIL_FAST", "").lower() in ("1", "true", "yes")
+        # Opt-in quiet mode: buffer per-test lines and emit them with the
+        # summary in one write instead of one syscall per result
+        self._quiet = os.environ.get("E2E_QUIET", "").lower() in ("1", "true", "yes")
+        self._log_buffer = []
+        # Monotonic ns clock: immune to NTP steps and cheaper than
+        # time.time()'s float gettimeofday path
+        self.start_time = time.perf_counter_ns()
+
+    def _get_toc(self):
+        """Fetch /api/toc once, returning (response, parsed_body_or_None)."""
+        with self._fetch_lock:
+            if self._toc_cache is None:
+                response = self.session.get(f"{BASE_URL}/api/toc", timeout=TIMEOUT)
+                data = _json(response) if response.status_code == 200 else None
+                self._toc_cache = (response, data)
+        return self._toc_cache
+
+    def _get_content(self):
+        """Fetch /api/content once, returning (response, parsed_body_or_None)."""
+        with self._fetch_lock:
+            if self._content_cache is None:
+                response = self.session.get(f"{BASE_URL}/api/content", timeout=TIMEOUT)
+                data = _json(response) if response.status_code == 200 else None
+                self._content_cache = (response, data)
+        return self._content_cache
+
+    def _first_content_id(self):
+        """ID of the first content item, or None when the listing has none.
+
+        Both the specific-content and translation tests need this; the
+        cached listing makes the second call a dict lookup, not a request.
+        """
+        response, content_data = self._get_content()
+        if response.status_code != 200 or not content_data:
+            return None
+        items = content_data.get("items") or []
+        return items[0]["id"] if items else None
 
     def log_result(self, test_name: str, passed: bool, details: str = ""):
         """Log test result"""
-        result = {
-            "test_name": test_name,
-            "passed": passed,
-            "details": details,
-            "timestamp": time.time()
-        }
-        self.test_results.append(result)
+        result = (test_name, passed, details, time.perf_counter_ns())
         status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{status} {test_name} - {details}")
+        line = f"{status} {test_name} - {details}"
+        # Test groups run concurrently in run_all_tests; serialize appends
+        with self._results_lock:
+            self.test_results.append(result)
+            if self._quiet:
+                self._log_buffer.append(line)
+        if not self._quiet:
+            print(line)
 
     def test_user_story_1_read_book_content(self) -> bool:
         """
@@ -53,9 +170,8 @@ class EndToEndTestSuite:
 
         # Test 1: Get table of contents
         try:
-            response = self.session.get(f"{BASE_URL}/api/toc", timeout=TIMEOUT)
+            response, toc_data = self._get_toc()
             if response.status_code == 200:
-                toc_data = response.json()
                 if "chapters" in toc_data and len(toc_data["chapters"]) > 0:
                     self.log_result("Get Table of Contents", True, "Successfully retrieved TOC with chapters")
                 else:
@@ -68,11 +184,13 @@ class EndToEndTestSuite:
             self.log_result("Get Table of Contents", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 2: List content
         try:
-            response = self.session.get(f"{BASE_URL}/api/content", timeout=TIMEOUT)
+            response, content_data = self._get_content()
             if response.status_code == 200:
-                content_data = response.json()
                 if "items" in content_data and len(content_data["items"]) > 0:
                     self.log_result("List Book Content", True, f"Retrieved {len(content_data['items'])} content items")
                 else:
@@ -85,43 +203,45 @@ class EndToEndTestSuite:
             self.log_result("List Book Content", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 3: Get specific content
         try:
-            # First get a content ID from the list
-            response = self.session.get(f"{BASE_URL}/api/content", timeout=TIMEOUT)
-            if response.status_code == 200:
-                content_data = response.json()
-                if "items" in content_data and len(content_data["items"]) > 0:
-                    content_id = content_data["items"][0]["id"]
-
-                    # Now get the specific content
-                    response = self.session.get(f"{BASE_URL}/api/content/{content_id}", timeout=TIMEOUT)
-                    if response.status_code == 200:
-                        content = response.json()
-                        if "title" in content and "content" in content:
-                            self.log_result("Get Specific Content", True, f"Retrieved content: {content['title']}")
-                        else:
-                            self.log_result("Get Specific Content", False, "Missing required fields in response")
-                            all_passed = False
+            content_id = self._first_content_id()
+            if content_id is not None:
+                # Now get the specific content
+                response = self.session.get(f"{BASE_URL}/api/content/{content_id}", timeout=TIMEOUT)
+                if response.status_code == 200:
+                    content = _json(response)
+                    if "title" in content and "content" in content:
+                        self.log_result("Get Specific Content", True, f"Retrieved content: {content['title']}")
                     else:
-                        self.log_result("Get Specific Content", False, f"Status code: {response.status_code}")
+                        self.log_result("Get Specific Content", False, "Missing required fields in response")
                         all_passed = False
                 else:
-                    self.log_result("Get Specific Content", False, "No content available to test")
+                    self.log_result("Get Specific Content", False, f"Status code: {response.status_code}")
                     all_passed = False
             else:
-                self.log_result("Get Specific Content", False, "Could not retrieve content list")
+                response, _ = self._get_content()
+                detail = ("No content available to test" if response.status_code == 200
+                          else "Could not retrieve content list")
+                self.log_result("Get Specific Content", False, detail)
                 all_passed = False
         except Exception as e:
             self.log_result("Get Specific Content", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 4: Test reading progress (if available)
         try:
-            import uuid
             session_id = str(uuid.uuid4())
 
-            response = self.session.get(f"{BASE_URL}/api/content/reading-progress/{session_id}", timeout=TIMEOUT)
+            # Only the status code matters; don't download the body
+            response = self.session.get(f"{BASE_URL}/api/content/reading-progress/{session_id}", timeout=TIMEOUT, stream=True)
+            response.close()
             # This might return 404 if no progress exists, which is OK
             if response.status_code in [200, 404]:
                 self.log_result("Reading Progress Retrieval", True, f"Status: {response.status_code}")
@@ -149,19 +269,14 @@ class EndToEndTestSuite:
 
         # Test 1: Perform a search
         try:
-            search_payload = {
-                "query": "AI",  # Common search term
-                "limit": 5
-            }
-
             response = self.session.post(
                 f"{BASE_URL}/api/search",
-                json=search_payload,
+                data=_SEARCH_AI_BODY,
                 timeout=TIMEOUT
             )
 
             if response.status_code == 200:
-                search_results = response.json()
+                search_results = _json(response)
                 if "results" in search_results:
                     result_count = len(search_results["results"])
                     self.log_result("Search Functionality", True, f"Found {result_count} results")
@@ -175,16 +290,14 @@ class EndToEndTestSuite:
             self.log_result("Search Functionality", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 2: Search with empty query (should handle gracefully)
         try:
-            search_payload = {
-                "query": "",
-                "limit": 5
-            }
-
             response = self.session.post(
                 f"{BASE_URL}/api/search",
-                json=search_payload,
+                data=_SEARCH_EMPTY_BODY,
                 timeout=TIMEOUT
             )
 
@@ -198,21 +311,19 @@ class EndToEndTestSuite:
             self.log_result("Empty Search Query", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 3: Search performance (should be under 3 seconds)
         try:
-            start_time = time.time()
-            search_payload = {
-                "query": "information",
-                "limit": 10
-            }
-
+            start_time = time.perf_counter_ns()
             response = self.session.post(
                 f"{BASE_URL}/api/search",
-                json=search_payload,
+                data=_SEARCH_INFO_BODY,
                 timeout=TIMEOUT
             )
 
-            response_time = time.time() - start_time
+            response_time = (time.perf_counter_ns() - start_time) / 1e9
 
             if response.status_code == 200 and response_time < 3.0:
                 self.log_result("Search Performance", True, f"Completed in {response_time:.3f}s")
@@ -241,21 +352,35 @@ class EndToEndTestSuite:
 
         all_passed = True
 
-        # Test 1: AI assistant functionality
+        # Tests 1 and 3 have no data dependency, so issue both AI probes
+        # as one concurrent batch and evaluate the responses separately;
+        # the timed performance probe (Test 2) stays on its own so
+        # concurrent load cannot inflate its measurement.
         try:
-            ai_payload = {
-                "question": "What is the main topic of this book?",
-                "include_sources": True
-            }
-
-            response = self.session.post(
-                f"{BASE_URL}/api/ai-assistant",
-                json=ai_payload,
-                timeout=15  # AI might take longer
+            functionality_response, context_response = asyncio.run(
+                self._post_ai_batch([
+                    {
+                        "question": "What is the main topic of this book?",
+                        "include_sources": True
+                    },
+                    {
+                        "question": "What was discussed in the introduction?",
+                        "context_content_id": "introduction",  # This might not exist, but should handle gracefully
+                        "include_sources": True
+                    },
+                ])
             )
+        except Exception as e:
+            self.log_result("AI Assistant Response", False, f"Exception: {str(e)}")
+            self.log_result("AI with Context", False, f"Exception: {str(e)}")
+            functionality_response = context_response = None
+            all_passed = False
 
+        # Test 1: AI assistant functionality
+        if functionality_response is not None:
+            response = functionality_response
             if response.status_code == 200:
-                ai_response = response.json()
+                ai_response = _json(response)
                 if "answer" in ai_response:
                     answer_length = len(ai_response["answer"])
                     sources_count = len(ai_response.get("sources", []))
@@ -269,25 +394,20 @@ class EndToEndTestSuite:
             else:
                 self.log_result("AI Assistant Response", False, f"Status code: {response.status_code}")
                 all_passed = False
-        except Exception as e:
-            self.log_result("AI Assistant Response", False, f"Exception: {str(e)}")
-            all_passed = False
+
+        if self._fail_fast and not all_passed:
+            return False
 
         # Test 2: AI performance (should be under 5 seconds)
         try:
-            start_time = time.time()
-            ai_payload = {
-                "question": "Summarize the main concepts",
-                "include_sources": True
-            }
-
+            start_time = time.perf_counter_ns()
             response = self.session.post(
                 f"{BASE_URL}/api/ai-assistant",
-                json=ai_payload,
-                timeout=15
+                data=_AI_SUMMARY_BODY,
+                timeout=AI_TIMEOUT
             )
 
-            response_time = time.time() - start_time
+            response_time = (time.perf_counter_ns() - start_time) / 1e9
 
             if response.status_code == 200:
                 if response_time < 5.0:
@@ -305,31 +425,30 @@ class EndToEndTestSuite:
             self.log_result("AI Performance", False, f"Exception: {str(e)}")
             all_passed = False
 
-        # Test 3: AI with context
-        try:
-            ai_payload = {
-                "question": "What was discussed in the introduction?",
-                "context_content_id": "introduction",  # This might not exist, but should handle gracefully
-                "include_sources": True
-            }
-
-            response = self.session.post(
-                f"{BASE_URL}/api/ai-assistant",
-                json=ai_payload,
-                timeout=15
-            )
+        if self._fail_fast and not all_passed:
+            return False
 
+        # Test 3: AI with context
+        if context_response is not None:
+            response = context_response
             if response.status_code in [200, 404, 422]:  # 404 if context doesn't exist, 422 if invalid
                 self.log_result("AI with Context", True, f"Handled gracefully (status: {response.status_code})")
             else:
                 self.log_result("AI with Context", False, f"Status code: {response.status_code}")
                 all_passed = False
-        except Exception as e:
-            self.log_result("AI with Context", False, f"Exception: {str(e)}")
-            all_passed = False
 
         return all_passed
 
+    async def _post_ai_batch(self, payloads: List[Dict]) -> List:
+        """POST the AI-assistant payloads concurrently, preserving order."""
+        limits = httpx.Limits(max_keepalive_connections=20)
+        timeout = httpx.Timeout(15.0, connect=1.0)
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            return await asyncio.gather(*[
+                client.post(f"{BASE_URL}/api/ai-assistant", json=payload)
+                for payload in payloads
+            ])
+
     def test_user_story_4_translation(self) -> bool:
         """
         Test User Story 4: Access Urdu Translation and Summaries
@@ -344,37 +463,38 @@ class EndToEndTestSuite:
 
         # Test 1: Check if translation endpoints are available
         try:
-            # Try to get available translations for a content item
-            # First, get a content ID
-            response = self.session.get(f"{BASE_URL}/api/content", timeout=TIMEOUT)
-            if response.status_code == 200:
-                content_data = response.json()
-                if "items" in content_data and len(content_data["items"]) > 0:
-                    content_id = content_data["items"][0]["id"]
-
-                    # Try to get translations for this content
-                    response = self.session.get(
-                        f"{BASE_URL}/api/translation/{content_id}?lang=ur",
-                        timeout=TIMEOUT
-                    )
+            # Try to get available translations for a content item,
+            # reusing the cached content listing to pick the ID
+            content_id = self._first_content_id()
+            if content_id is not None:
+                # Try to get translations for this content; only the
+                # status code is checked, so skip the body download
+                response = self.session.get(
+                    f"{BASE_URL}/api/translation/{content_id}?lang=ur",
+                    timeout=TIMEOUT,
+                    stream=True
+                )
+                response.close()
 
-                    # Could be 200 (found), 404 (not found), or other error
-                    if response.status_code in [200, 404, 400]:
-                        self.log_result("Translation Retrieval", True, f"Handled gracefully (status: {response.status_code})")
-                    else:
-                        self.log_result("Translation Retrieval", False, f"Unexpected status: {response.status_code}")
-                        all_passed = False
+                # Could be 200 (found), 404 (not found), or other error
+                if response.status_code in [200, 404, 400]:
+                    self.log_result("Translation Retrieval", True, f"Handled gracefully (status: {response.status_code})")
                 else:
-                    self.log_result("Translation Retrieval", True, "No content available, but endpoint accessible")
+                    self.log_result("Translation Retrieval", False, f"Unexpected status: {response.status_code}")
+                    all_passed = False
             else:
                 self.log_result("Translation Retrieval", True, "No content available, but endpoint accessible")
         except Exception as e:
             self.log_result("Translation Retrieval", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 2: Check if translation management endpoint works
         try:
-            response = self.session.get(f"{BASE_URL}/api/translation", timeout=TIMEOUT)
+            response = self.session.get(f"{BASE_URL}/api/translation", timeout=TIMEOUT, stream=True)
+            response.close()
             # Should return 405 (method not allowed) or 404, not 404/500 error
             if response.status_code in [404, 405]:
                 self.log_result("Translation Management", True, "Endpoint exists (status: {response.status_code})")
@@ -403,7 +523,7 @@ class EndToEndTestSuite:
         try:
             response = self.session.get(f"{BASE_URL}/api/health", timeout=TIMEOUT)
             if response.status_code == 200:
-                health_data = response.json()
+                health_data = _json(response)
                 if "status" in health_data:
                     self.log_result("Health Check", True, f"Status: {health_data['status']}")
                 else:
@@ -416,9 +536,13 @@ class EndToEndTestSuite:
             self.log_result("Health Check", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 2: Error handling - invalid endpoint
         try:
-            response = self.session.get(f"{BASE_URL}/api/invalid-endpoint", timeout=TIMEOUT)
+            response = self.session.get(f"{BASE_URL}/api/invalid-endpoint", timeout=TIMEOUT, stream=True)
+            response.close()
             if response.status_code == 404:
                 self.log_result("Error Handling", True, "Properly handles invalid endpoints")
             else:
@@ -428,15 +552,14 @@ class EndToEndTestSuite:
             self.log_result("Error Handling", False, f"Exception: {str(e)}")
             all_passed = False
 
+        if self._fail_fast and not all_passed:
+            return False
+
         # Test 3: Rate limiting (if implemented)
         try:
-            # Make multiple requests quickly to test rate limiting
-            for i in range(5):
-                response = self.session.post(
-                    f"{BASE_URL}/api/search",
-                    json={"query": f"test{i}", "limit": 1},
-                    timeout=TIMEOUT
-                )
+            # Fire the probes concurrently so the burst actually lands on
+            # the backend as simultaneous load rather than a serial trickle
+            asyncio.run(self._probe_search_burst(5))
 
             # The responses should not be 429 unless we exceeded limits
             # This test is more about ensuring the system doesn't crash
@@ -447,6 +570,29 @@ class EndToEndTestSuite:
 
         return all_passed
 
+    async def _probe_search_burst(self, count: int) -> List:
+        """Issue `count` concurrent search requests over one async client."""
+        limits = httpx.Limits(max_keepalive_connections=20)
+        timeout = httpx.Timeout(10.0, connect=1.0)
+        async with httpx.AsyncClient(limits=limits, timeout=timeout) as client:
+            # Build each request up front so URL parsing and header
+            # merging happen once, outside the send fan-out
+            burst_requests = [
+                client.build_request(
+                    "POST",
+                    f"{BASE_URL}/api/search",
+                    content=body,
+                    headers={"Content-Type": "application/json"},
+                )
+                for body in _BURST_BODIES[:count]
+            ]
+            responses = await asyncio.gather(*[
+                client.send(request, stream=True) for request in burst_requests
+            ])
+            # Bodies are discarded; close without reading them
+            await asyncio.gather(*[r.aclose() for r in responses])
+            return responses
+
     def run_all_tests(self) -> Dict:
         """
         Run all end-to-end tests and return comprehensive results
@@ -454,16 +600,34 @@ class EndToEndTestSuite:
         print("Starting End-to-End Testing Suite for AI-Native Book")
         print("="*60)
 
-        # Run all user story tests
-        us1_result = self.test_user_story_1_read_book_content()
-        us2_result = self.test_user_story_2_search_book_content()
-        us3_result = self.test_user_story_3_ai_assistant()
-        us4_result = self.test_user_story_4_translation()
-        cross_cutting_result = self.test_cross_cutting_features()
+        # The test groups are independent, so run them concurrently and
+        # overlap their network waits; the shared session pools sockets
+        # and log_result serializes result appends.
+        test_groups = {
+            "user_story_1": self.test_user_story_1_read_book_content,
+            "user_story_2": self.test_user_story_2_search_book_content,
+            "user_story_3": self.test_user_story_3_ai_assistant,
+            "user_story_4": self.test_user_story_4_translation,
+            "cross_cutting": self.test_cross_cutting_features,
+        }
+        group_results = {}
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            future_to_name = {
+                executor.submit(test_method): name
+                for name, test_method in test_groups.items()
+            }
+            for future in as_completed(future_to_name):
+                group_results[future_to_name[future]] = future.result()
+
+        us1_result = group_results["user_story_1"]
+        us2_result = group_results["user_story_2"]
+        us3_result = group_results["user_story_3"]
+        us4_result = group_results["user_story_4"]
+        cross_cutting_result = group_results["cross_cutting"]
 
         # Calculate overall results
         total_tests = len(self.test_results)
-        passed_tests = sum(1 for r in self.test_results if r["passed"])
+        passed_tests = sum(1 for r in self.test_results if r[1])
         failed_tests = total_tests - passed_tests
 
         overall_success = all([us1_result, us2_result, us3_result, us4_result, cross_cutting_result])
@@ -474,8 +638,16 @@ class EndToEndTestSuite:
             "passed_tests": passed_tests,
             "failed_tests": failed_tests,
             "success_rate": passed_tests / total_tests if total_tests > 0 else 0,
-            "test_results": self.test_results,
-            "execution_time": time.time() - self.start_time,
+            "test_results": [
+                {
+                    "test_name": name,
+                    "passed": result_passed,
+                    "details": result_details,
+                    "timestamp_ns": timestamp_ns,
+                }
+                for name, result_passed, result_details, timestamp_ns in self.test_results
+            ],
+            "execution_time": (time.perf_counter_ns() - self.start_time) / 1e9,
             "user_stories": {
                 "user_story_1": us1_result,
                 "user_story_2": us2_result,
@@ -485,23 +657,29 @@ class EndToEndTestSuite:
             }
         }
 
-        # Print summary
-        print("\n" + "="*60)
-        print("END-TO-END TEST RESULTS SUMMARY")
-        print("="*60)
-        print(f"Overall Success: {'✅ PASS' if results_summary['overall_success'] else '❌ FAIL'}")
-        print(f"Total Tests: {results_summary['total_tests']}")
-        print(f"Passed: {results_summary['passed_tests']}")
-        print(f"Failed: {results_summary['failed_tests']}")
-        print(f"Success Rate: {results_summary['success_rate']:.2%}")
-        print(f"Execution Time: {results_summary['execution_time']:.2f}s")
-
-        print("\nUser Story Results:")
-        print(f"  User Story 1 (Read Content): {'✅ PASS' if us1_result else '❌ FAIL'}")
-        print(f"  User Story 2 (Search Content): {'✅ PASS' if us2_result else '❌ FAIL'}")
-        print(f"  User Story 3 (AI Assistant): {'✅ PASS' if us3_result else '❌ FAIL'}")
-        print(f"  User Story 4 (Translation): {'✅ PASS' if us4_result else '❌ FAIL'}")
-        print(f"  Cross-Cutting: {'✅ PASS' if cross_cutting_result else '❌ FAIL'}")
+        # Emit the whole report (plus any buffered per-test lines) in a
+        # single write instead of ~12 separate print syscalls
+        lines = self._log_buffer + [
+            "",
+            "="*60,
+            "END-TO-END TEST RESULTS SUMMARY",
+            "="*60,
+            f"Overall Success: {'✅ PASS' if results_summary['overall_success'] else '❌ FAIL'}",
+            f"Total Tests: {results_summary['total_tests']}",
+            f"Passed: {results_summary['passed_tests']}",
+            f"Failed: {results_summary['failed_tests']}",
+            f"Success Rate: {results_summary['success_rate']:.2%}",
+            f"Execution Time: {results_summary['execution_time']:.2f}s",
+            "",
+            "User Story Results:",
+            f"  User Story 1 (Read Content): {'✅ PASS' if us1_result else '❌ FAIL'}",
+            f"  User Story 2 (Search Content): {'✅ PASS' if us2_result else '❌ FAIL'}",
+            f"  User Story 3 (AI Assistant): {'✅ PASS' if us3_result else '❌ FAIL'}",
+            f"  User Story 4 (Translation): {'✅ PASS' if us4_result else '❌ FAIL'}",
+            f"  Cross-Cutting: {'✅ PASS' if cross_cutting_result else '❌ FAIL'}",
+        ]
+        self._log_buffer = []
+        sys.stdout.write("\n".join(lines) + "\n")
 
         return results_summary
 
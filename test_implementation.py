@@ -1,13 +1,114 @@
 """
 Basic test script to verify the implementation of the AI-Native Book with Docusaurus
 """
+import mmap
 import os
+import re
 import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
+# Optional: pyahocorasick scans all markers in one DFA pass regardless
+# of how many there are; without it the compiled alternations below do
+# one regex pass per file.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# One compiled alternation per scanned file: a single C-level pass over
+# the raw bytes replaces one substring scan per marker and skips the
+# UTF-8 decode that read_text() performs.
+_SEARCH_API_MARKERS = re.compile(rb"offset|include_highlights|suggest")
+_SEARCH_SERVICE_MARKERS = re.compile(rb"get_suggestions|get_total_search_count")
+_TRANSLATION_JS_MARKERS = re.compile(rb"getContentWithFallback|fetchTranslation")
+_README_MARKERS = re.compile(
+    rb"Search Functionality|AI Assistant|Translation Support|API Endpoints"
+)
+_RTL_MARKERS = re.compile(rb"\.rtl|direction: rtl")
+
+_ALL_MARKERS = (
+    'offset', 'include_highlights', 'suggest',
+    'get_suggestions', 'get_total_search_count',
+    'getContentWithFallback', 'fetchTranslation',
+    'Search Functionality', 'AI Assistant', 'Translation Support',
+    'API Endpoints',
+    '.rtl', 'direction: rtl',
+)
+
+if ahocorasick is not None:
+    _AUTOMATON = ahocorasick.Automaton()
+    for _marker in _ALL_MARKERS:
+        _AUTOMATON.add_word(_marker, _marker)
+    _AUTOMATON.make_automaton()
+else:
+    _AUTOMATON = None
+
+def _map_file(path):
+    """Map a file read-only; the marker scans then run zero-copy against
+    the page cache with no bytes copy or UTF-8 decode."""
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return b''
+
+def _read_blobs(root, rel_paths):
+    """Map several files concurrently; returns {rel_path: buffer or None}.
+
+    The opens are independent, so a small thread pool overlaps their
+    latency instead of paying it once per file in sequence.
+    """
+    def _read(rel):
+        try:
+            return _map_file(root / rel)
+        except OSError:
+            return None
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return dict(zip(rel_paths, executor.map(_read, rel_paths)))
+
+def _marker_hits(data, pattern):
+    """Return the set of marker bytes found in one pass over the buffer."""
+    if _AUTOMATON is not None:
+        text = bytes(data).decode("utf-8", "ignore")
+        found = {value for _, value in _AUTOMATON.iter(text)}
+        return {marker.encode() for marker in found}
+    return set(pattern.findall(data))
+
+# Heavyweight directories that never contain anything the checks look for
+_PRUNE_DIRS = {'node_modules', '.git', '.venv', '__pycache__'}
+
+_Scan = namedtuple('_Scan', ['dirs', 'files'])
+
+@lru_cache(maxsize=1)
+def _scan():
+    """Walk the project once into (dirs, files) sets shared by all checks.
+
+    One pruned directory scan replaces the per-candidate Path.exists()
+    stat syscalls; membership tests against the sets are O(1), and the
+    cache means the three check functions share a single walk.
+    """
+    root = Path.cwd()
+    dirs = set()
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(root, topdown=True):
+        dirnames[:] = [d for d in dirnames if d not in _PRUNE_DIRS]
+        rel = os.path.relpath(dirpath, root)
+        prefix = "" if rel == "." else rel.replace(os.sep, "/")
+        if prefix:
+            dirs.add(prefix)
+            prefix += "/"
+        for name in filenames:
+            files.add(prefix + name)
+    return _Scan(dirs=dirs, files=files)
+
 def check_directory_structure():
     """Check if the expected directories exist"""
-    project_root = Path.cwd()
+    scan = _scan()
 
     # Check main directories
     required_dirs = [
@@ -19,7 +120,7 @@ def check_directory_structure():
     ]
 
     for dir_name in required_dirs:
-        if not (project_root / dir_name).exists():
+        if dir_name not in scan.dirs:
             print(f"[ERROR] Missing directory: {dir_name}")
             return False
         else:
@@ -34,7 +135,7 @@ def check_directory_structure():
     ]
 
     for dir_path in website_dirs:
-        if not (project_root / dir_path).exists():
+        if dir_path not in scan.dirs:
             print(f"[ERROR] Missing website directory: {dir_path}")
             return False
         else:
@@ -49,7 +150,7 @@ def check_directory_structure():
     ]
 
     for dir_path in backend_dirs:
-        if not (project_root / dir_path).exists():
+        if dir_path not in scan.dirs:
             print(f"[ERROR] Missing backend directory: {dir_path}")
             return False
         else:
@@ -60,6 +161,17 @@ def check_directory_structure():
 def check_files():
     """Check if the key files exist and contain expected content"""
     project_root = Path.cwd()
+    scan = _scan()
+
+    # Prefetch every file whose contents get scanned below; the marker
+    # checks then run against in-memory bytes with no further I/O
+    scanned_files = [
+        'backend/app/api/search.py',
+        'backend/app/services/search_service.py',
+        'website/src/utils/translationService.js',
+        'README.md',
+    ]
+    blobs = _read_blobs(project_root, [p for p in scanned_files if p in scan.files])
 
     # Check backend files
     backend_files = [
@@ -70,8 +182,7 @@ def check_files():
     ]
 
     for file_path in backend_files:
-        full_path = project_root / file_path
-        if not full_path.exists():
+        if file_path not in scan.files:
             print(f"[ERROR] Missing file: {file_path}")
             return False
         else:
@@ -79,18 +190,18 @@ def check_files():
 
             # Check if search functionality is enhanced
             if file_path == 'backend/app/api/search.py':
-                content = full_path.read_text()
-                if 'offset' in content and 'include_highlights' in content:
+                hits = _marker_hits(blobs[file_path], _SEARCH_API_MARKERS)
+                if b'offset' in hits and b'include_highlights' in hits:
                     print(f"  [OK] Enhanced search API with pagination and highlights")
-                if 'suggest' in content:
+                if b'suggest' in hits:
                     print(f"  [OK] Search suggestions endpoint implemented")
 
             # Check if translation functionality is implemented
             if file_path == 'backend/app/services/search_service.py':
-                content = full_path.read_text()
-                if 'get_suggestions' in content:
+                hits = _marker_hits(blobs[file_path], _SEARCH_SERVICE_MARKERS)
+                if b'get_suggestions' in hits:
                     print(f"  [OK] Search suggestions service implemented")
-                if 'get_total_search_count' in content:
+                if b'get_total_search_count' in hits:
                     print(f"  [OK] Search pagination service implemented")
 
     # Check website files
@@ -101,8 +212,7 @@ def check_files():
     ]
 
     for file_path in website_files:
-        full_path = project_root / file_path
-        if not full_path.exists():
+        if file_path not in scan.files:
             print(f"[ERROR] Missing file: {file_path}")
             return False
         else:
@@ -110,16 +220,14 @@ def check_files():
 
             # Check if translation functionality is implemented
             if file_path == 'website/src/utils/translationService.js':
-                content = full_path.read_text()
-                if 'getContentWithFallback' in content:
+                hits = _marker_hits(blobs[file_path], _TRANSLATION_JS_MARKERS)
+                if b'getContentWithFallback' in hits:
                     print(f"  [OK] Translation fallback mechanism implemented")
-                if 'fetchTranslation' in content:
+                if b'fetchTranslation' in hits:
                     print(f"  [OK] Translation API service implemented")
 
     # Check README
-    readme_path = project_root / 'README.md'
-    if readme_path.exists():
-        content = readme_path.read_text()
+    if 'README.md' in scan.files:
         expected_sections = [
             'Search Functionality',
             'AI Assistant',
@@ -127,10 +235,11 @@ def check_files():
             'API Endpoints'
         ]
 
-        missing_sections = []
-        for section in expected_sections:
-            if section not in content:
-                missing_sections.append(section)
+        hits = _marker_hits(blobs['README.md'], _README_MARKERS)
+        missing_sections = [
+            section for section in expected_sections
+            if section.encode() not in hits
+        ]
 
         if missing_sections:
             print(f"[ERROR] Missing sections in README: {missing_sections}")
@@ -141,8 +250,7 @@ def check_files():
         return False
 
     # Check troubleshooting guide
-    troubleshooting_path = project_root / 'docs/troubleshooting.md'
-    if troubleshooting_path.exists():
+    if 'docs/troubleshooting.md' in scan.files:
         print(f"[OK] Troubleshooting guide exists")
     else:
         print(f"[ERROR] Troubleshooting guide not found")
@@ -153,6 +261,7 @@ def check_files():
 def check_component_features():
     """Check if key components have been implemented"""
     project_root = Path.cwd()
+    scan = _scan()
 
     # Check translation components
     translation_components = [
@@ -161,7 +270,7 @@ def check_component_features():
     ]
 
     for comp_path in translation_components:
-        if not (project_root / comp_path).exists():
+        if comp_path not in scan.dirs:
             print(f"[ERROR] Missing translation component: {comp_path}")
             return False
         else:
@@ -174,7 +283,7 @@ def check_component_features():
     ]
 
     for css_path in css_files:
-        if not (project_root / css_path).exists():
+        if css_path not in scan.files:
             print(f"[ERROR] Missing CSS file: {css_path}")
             return False
         else:
@@ -182,8 +291,8 @@ def check_component_features():
 
             # Check for RTL support
             if 'TranslationToggle.module.css' in css_path:
-                content = (project_root / css_path).read_text()
-                if '.rtl' in content and 'direction: rtl' in content:
+                hits = _marker_hits(_map_file(project_root / css_path), _RTL_MARKERS)
+                if b'.rtl' in hits and b'direction: rtl' in hits:
                     print(f"  [OK] RTL support implemented for Urdu")
 
     return True